@@ -0,0 +1,85 @@
+"""
+Benchmark of the searches of the Selector (without display): time taken by each search on the Tk thread for a large list of items
+
+Usage: python "Benchmarks/selector_search.py" [number of items]
+The items are random file names generated from a fixed seed, so the results can be compared between versions.
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import time
+
+# the package is loaded from the "Source Code" directory of the repository
+_source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Source Code")
+_spec = importlib.util.spec_from_file_location("MoreCustomTkinterWidgets", os.path.join(_source, "__init__.py"), submodule_search_locations=[_source])
+_package = importlib.util.module_from_spec(_spec)
+sys.modules["MoreCustomTkinterWidgets"] = _package
+_spec.loader.exec_module(_package)
+from MoreCustomTkinterWidgets.Selector import _SearchIndex
+from MoreCustomTkinterWidgets.Matching import match_score
+
+
+def make_items(count: int, seed: int = 0) -> list[str]:
+    """ Returns count different random file names """
+    generator = random.Random(seed)
+    syllables = ["ba", "ko", "ri", "men", "tal", "os", "ve", "qui", "zar", "lu", "ne", "pho", "st", "da", "gy", "xe", "wi", "ju", "ca", "fen"]
+    extensions = [".txt", ".png", ".py", ".csv", ".json", ".mp3", ".pdf"]
+    items = set()
+    while len(items) < count:
+        words = ["".join(generator.choices(syllables, k=generator.randint(1, 4))) for _ in range(generator.randint(1, 3))]
+        items.add(generator.choice(["_", " ", "-"]).join(words).capitalize() + str(generator.randint(0, 999)) + generator.choice(extensions))
+    return list(items)
+
+
+def brute_force(items: list[str], query: str, limit: int) -> list[int]:
+    """ Returns the expected results of a ranked search """
+    folded = [item.casefold() for item in items]
+    scores = [(match_score(query, text), len(text), index) for index, text in enumerate(folded)]
+    return [index for score, length, index in sorted(score for score in scores if score[0] is not None)[:limit]]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    limit = 100
+    items = make_items(count)
+    index = _SearchIndex(items)
+    index.search_ranked("warm", limit)  # builds the indexes
+    if index._trigrams_thread is not None:
+        index._trigrams_thread.join()
+
+    queries = ["abc", "hel", "xqj", "zzq", "qux", "stone", "aeiou", "ko_ri", "b", "ba", "zarqui"]
+    print(f"{count} items, {limit} results")
+    print("slice: time of a search or of a resumed search (the Tk thread is blocked for a slice), the results are exact after the last slice")
+    print(f"{'query':>10} {'first slice (ms)':>17} {'slowest slice (ms)':>19} {'slices':>7} {'total (ms)':>11} {'exact':>6}")
+    worst = 0.
+    for query in queries:
+        slices = []
+        for repeat in range(5):  # the slices of the fastest repeat are kept
+            index._last_ranked = None  # every search starts from scratch, like the first key typed
+            times = []
+            start = time.perf_counter()
+            results = index.search_ranked(query, limit)
+            times.append((time.perf_counter() - start) * 1000)
+            while index.ranked_pending:
+                start = time.perf_counter()
+                results = index.continue_ranked()
+                times.append((time.perf_counter() - start) * 1000)
+            if not slices or sum(times) < sum(slices):
+                slices = times
+        worst = max(worst, max(slices))
+        print(f"{query:>10} {slices[0]:>17.2f} {max(slices):>19.2f} {len(slices):>7} {sum(slices):>11.2f} {str(results == brute_force(items, query, limit)):>6}")
+
+    typed = "zarquiba"
+    start = time.perf_counter()
+    for end in range(1, len(typed) + 1):  # the results of each key refine the previous ones
+        index.search_ranked(typed[:end], limit)
+        while index.ranked_pending:
+            index.continue_ranked()
+    print(f"typing {typed!r} key by key: {(time.perf_counter() - start) * 1000 / len(typed):.2f} ms per key")
+    print(f"slowest slice: {worst:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,376 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
+import tkinter
+from PIL import Image, ImageChops, ImageTk
 import os
+import threading
+import time
+import weakref
+from collections import deque
 from typing import Tuple
 
 
+class _FrameStore:
+    _keyframe_interval = 16  # a fully composited frame is kept every _keyframe_interval frames
+
+    def __init__(self, image: Image.Image):
+        """Frames of an animated image, decoded once into an index owned by the store
+
+        The first frame is decoded immediately, the other frames are decoded in a background thread, the frames are resized when they are requested.
+        The source image is only used by the background thread.
+        The index keeps a fully composited keyframe every _keyframe_interval frames and, for the other frames, the region that changed since the previous frame:
+        any frame is rebuilt from its keyframe with a bounded number of regions, and from the last rebuilt frame when the frames are read in order.
+
+        :param image: animated PIL image (FLI/FLC, GIF...)
+        """
+        image.seek(0)
+        first_frame = image.convert("RGBA")
+        self._keyframes = [first_frame]  # composited frames 0, _keyframe_interval, 2 * _keyframe_interval...
+        self._deltas = [None]  # (box, region) changed since the previous frame for each frame, None for the keyframes and the unchanged frames
+        self.durations = [self._duration(image)]  # display time of each frame (in ms)
+        self.decoded = 1  # number of decoded frames
+        self.count = None  # number of frames, known once all the frames are decoded
+        self._image = image
+        self._last_frame = first_frame  # last decoded frame, compared to the next one by the background thread
+        self._cursor = (0, first_frame.copy())  # (index, composited image) of the last rebuilt frame
+        self._cursor_lock = threading.Lock()  # the frames are rebuilt by both threads
+        self._condition = threading.Condition()  # notified when a frame is decoded
+        self._stopped = threading.Event()
+        threading.Thread(target=self._work, daemon=True).start()
+
+    @staticmethod
+    def _duration(image: Image.Image) -> int:
+        """ Returns the duration of the current frame of the image, 100ms if it is not given (like the web browsers) """
+        return image.info.get("duration") or 100
+
+    @staticmethod
+    def _changed_box(previous: Image.Image, frame: Image.Image) -> tuple[int, int, int, int] | None:
+        """ Returns the box of the pixels that differ between the two frames, None if they are identical """
+        boxes = [box for box in (band.getbbox() for band in ImageChops.difference(previous, frame).split()) if box is not None]
+        if not boxes:
+            return None
+        return min(box[0] for box in boxes), min(box[1] for box in boxes), max(box[2] for box in boxes), max(box[3] for box in boxes)
+
+    def _work(self):
+        """ Internal method executed in a background thread: decodes the frames until the end of the image """
+        while not self._stopped.is_set() and self.count is None:
+            try:
+                self._image.seek(self.decoded)
+                frame = self._image.convert("RGBA")
+            except Exception:  # end of the image, or truncated / corrupted frame: the animation keeps the frames decoded before it
+                frame = None
+            with self._condition:
+                if frame is None:
+                    self.count = self.decoded
+                    self._last_frame = None
+                else:
+                    if self.decoded % self._keyframe_interval == 0:
+                        self._keyframes.append(frame)
+                        self._deltas.append(None)
+                    else:
+                        box = self._changed_box(self._last_frame, frame)
+                        self._deltas.append((box, frame.crop(box)) if box is not None else None)
+                    self.durations.append(self._duration(self._image))
+                    self._last_frame = frame
+                    self.decoded += 1  # increased last, so the data of every decoded frame is available
+                self._condition.notify_all()
+
+    def frame(self, index: int, size: Tuple[int, int] = None) -> Image.Image:
+        """Returns a copy of the given decoded frame, rebuilt from the last rebuilt frame if it is between its keyframe and the given frame, from its keyframe otherwise
+
+        :param index: index of the frame
+        :param size: size to resize the frame to, None to keep its size
+        :return: new image
+        """
+        with self._cursor_lock:
+            cursor_index, image = self._cursor
+            keyframe_index = index - index % self._keyframe_interval
+            if not keyframe_index <= cursor_index <= index:
+                cursor_index, image = keyframe_index, self._keyframes[keyframe_index // self._keyframe_interval].copy()
+            for delta in self._deltas[cursor_index + 1:index + 1]:
+                if delta is not None:
+                    image.paste(delta[1], delta[0][:2])
+            self._cursor = (index, image)
+            return image.resize(size) if size is not None else image.copy()
+
+    def resized_frame(self, index: int, size: Tuple[int, int]) -> Image.Image:
+        """ Returns the given decoded frame resized to the given size, the resized frames are not kept (only their PhotoImages) """
+        return self.frame(index, size)
+
+    def available(self, index: int) -> bool:
+        """ Returns True if the given frame is decoded """
+        return index < self.decoded
+
+    def duration(self, index: int) -> int:
+        """ Returns the display time of the given decoded frame (in ms) """
+        return self.durations[index]
+
+    def next_index(self, index: int) -> int | None:
+        """ Returns the index of the frame following the given one, None if it is not decoded yet """
+        if index + 1 < self.decoded:
+            return index + 1
+        elif self.count is not None:
+            return 0
+        return None
+
+    def wait_for(self, index: int) -> bool:
+        """ Waits until the given frame is decoded, returns False if the animation has less frames """
+        with self._condition:
+            self._condition.wait_for(lambda: index < self.decoded or self.count is not None or self._stopped.is_set())
+            return index < self.decoded
+
+    def advance(self, index: int):
+        """ Called when the given frame is shown, all the frames are kept """
+
+    def in_window(self, index: int) -> bool:
+        """ Returns True if the given frame is kept in memory """
+        return True
+
+    def stop(self):
+        """ Stops the background thread, the decoded frames stay available """
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+
+
+class _StreamStore:
+    def __init__(self, image: Image.Image, window: int):
+        """Frames of an animated image decoded in a background thread only a few frames ahead of the shown frame, the frames behind the shown frame are released
+
+        The memory used does not depend on the number of frames, but going back to a previous frame decodes the image again from this frame (from its first frame for the GIF images).
+        The source image is only used by the background thread.
+
+        :param image: animated PIL image (FLI/FLC, GIF...)
+        :param window: number of frames kept decoded, starting from the shown frame
+        """
+        image.seek(0)
+        self.window = window
+        self.count = None  # number of frames, known once the background thread reached the end of the image
+        self._frames = {0: (image.convert("RGBA"), _FrameStore._duration(image))}  # index: (composited frame, duration) of the decoded frames of the window
+        self._resized = {}  # (index, size): frame of the window resized to the size
+        self._sizes = set()  # sizes requested by the Tk thread, the next frames are resized to them by the background thread
+        self._start = 0  # index of the shown frame, first frame of the window
+        self._next = 1  # index of the next frame to decode
+        self._image = image
+        self._condition = threading.Condition()  # notified when a frame is decoded or when the window moves
+        self._stopped = threading.Event()
+        threading.Thread(target=self._work, daemon=True).start()
+
+    def _ahead(self, index: int) -> int:
+        """ Internal method: returns the number of frames between the start of the window and the given frame, negative if it is behind """
+        return (index - self._start) % self.count if self.count is not None else index - self._start
+
+    def _work(self):
+        """ Internal method executed in a background thread: decodes the frames of the window, waits when the window is full """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopped.is_set() or (self._next not in self._frames and self._ahead(self._next) < self.window))
+                if self._stopped.is_set():
+                    return
+                index, sizes = self._next, list(self._sizes)
+            try:
+                if self._image.tell() != index:
+                    self._image.seek(index)  # the frames are read in order, except when the window jumps to another frame
+                frame = self._image.convert("RGBA")
+            except Exception:  # end of the image, or truncated / corrupted frame: the animation keeps the frames before it
+                with self._condition:
+                    if index == self._next:
+                        count = self._frame_count(index)
+                        self.count = count if self.count is None else min(self.count, count)
+                        self._next = self._first_missing()
+                    self._condition.notify_all()
+                continue
+            duration = _FrameStore._duration(self._image)
+            resized = {size: frame.resize(size) for size in sizes}
+            with self._condition:
+                if index == self._next:  # the window did not jump to another frame during the decoding
+                    self._frames[index] = (frame, duration)
+                    for size, image in resized.items():
+                        self._resized[(index, size)] = image
+                    self._next = self._first_missing()
+                self._condition.notify_all()
+
+    def _first_missing(self) -> int:
+        """ Internal method: returns the first frame of the window that is not decoded, the frame following the window if they are all decoded """
+        index = self._start % self.count if self.count is not None else self._start
+        for _ in range(self.window):
+            if index not in self._frames:
+                return index
+            index = (index + 1) % self.count if self.count is not None else index + 1
+        return index
+
+    def _frame_count(self, failed: int) -> int:
+        """ Internal method: returns the number of frames of the image once the given frame could not be read """
+        try:
+            return min(self._image.n_frames, failed)
+        except Exception:  # no n_frames, or the image is truncated before its end
+            return failed
+
+    def available(self, index: int) -> bool:
+        """ Returns True if the given frame is decoded """
+        return index in self._frames
+
+    def duration(self, index: int) -> int:
+        """ Returns the display time of the given decoded frame (in ms) """
+        return self._frames[index][1]
+
+    def resized_frame(self, index: int, size: Tuple[int, int]) -> Image.Image:
+        """ Returns the given decoded frame resized to the given size, the frame is resized immediately if the background thread did not resize it yet """
+        with self._condition:
+            self._sizes.add(size)
+            if (index, size) not in self._resized:
+                self._resized[(index, size)] = self._frames[index][0].resize(size)
+            return self._resized[(index, size)]
+
+    def next_index(self, index: int) -> int | None:
+        """ Returns the index of the frame following the given one, None if it is not decoded yet """
+        index = (index + 1) % self.count if self.count is not None else index + 1
+        return index if index in self._frames else None
+
+    def wait_for(self, index: int) -> bool:
+        """ Waits until the given frame is decoded (the window is moved to it if needed), returns False if the animation has less frames """
+        if index not in self._frames:
+            self.advance(index)
+        with self._condition:
+            self._condition.wait_for(lambda: index in self._frames or (self.count is not None and index >= self.count) or self._stopped.is_set())
+            return index in self._frames
+
+    def advance(self, index: int):
+        """ Moves the window to the given frame, the frames behind it are released and the background thread decodes the next frames """
+        with self._condition:
+            self._start = index
+            for frame in [frame for frame in self._frames if not self.in_window(frame)]:
+                del self._frames[frame]
+            for key in [key for key in self._resized if key[0] not in self._frames]:
+                del self._resized[key]
+            self._next = self._first_missing()  # the frames kept after a jump back are not decoded again
+            self._condition.notify_all()
+
+    def in_window(self, index: int) -> bool:
+        """ Returns True if the given frame is in the window """
+        return 0 <= self._ahead(index) < self.window
+
+    def stop(self):
+        """ Stops the background thread """
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+
+
+class _AnimationClock:
+    def __init__(self):
+        """Clock shared by all the running animations: a single after() loop wakes up at the earliest frame deadline of the animations and updates all the due animations at once
+
+        The animations whose widgets are all unmapped are paused until one of their widgets is shown again.
+        The animations whose widgets were all destroyed are removed (they are added again when a new widget uses them), so the clock does not keep them alive.
+        """
+        self.max_frame_rate = None  # maximum number of updates per second, None for no limit
+        self._images = set()  # running AnimatedImages
+        self._root = None  # Tk root window used to schedule the updates (the other widgets can be destroyed)
+        self._after = None  # (id, monotonic time) of the scheduled update
+        self._last_tick = 0.  # monotonic time of the last update
+        self._paused_delay = 0.1  # time (in s) between 2 checks of the paused animations
+        self._coalesce_delay = 0.004  # the animations due in less than this time (in s) are updated with the due ones
+
+    def register(self, image: "AnimatedImage"):
+        """ Adds the given animation to the running animations (or wakes the clock up if it was already running) """
+        self._images.add(image)
+        self._schedule()
+
+    def unregister(self, image: "AnimatedImage"):
+        """ Removes the given animation from the running animations """
+        self._images.discard(image)
+        if not self._images:
+            self._cancel()
+            self._root = None  # taken again from the widgets of the next animation, the root window may be destroyed by then
+
+    def _cancel(self):
+        """ Internal method: cancels the scheduled update """
+        if self._after is not None:
+            try:
+                self._root.after_cancel(self._after[0])
+            except tkinter.TclError:  # the root window was destroyed
+                pass
+            self._after = None
+
+    def _schedule(self):
+        """ Internal method: schedules the next update at the earliest deadline of the running animations, keeps the scheduled update if it is earlier """
+        if not self._images:
+            return
+        now = time.monotonic()
+        next_time = min(image._next_time(now, self._paused_delay) for image in self._images)
+        if self.max_frame_rate is not None:
+            next_time = max(next_time, self._last_tick + 1 / self.max_frame_rate)
+        if self._after is not None:
+            if self._after[1] <= next_time:
+                return
+            self._cancel()
+        if self._root is None:
+            widgets = [widget for image in self._images for widget in image._widgets()]
+            if not widgets:  # the clock is started again when a widget uses one of the animations
+                return
+            self._root = widgets[0]._root()
+        try:
+            self._after = (self._root.after(max(0, round((next_time - now) * 1000)), self._tick), next_time)
+        except tkinter.TclError:  # the root window was destroyed, the next widgets give a new one
+            self._root = None
+            self._after = None
+
+    def _tick(self):
+        """ Internal method: updates all the due animations, the PhotoImages of their next frames are created once Tk is idle """
+        self._after = None
+        self._last_tick = time.monotonic()
+        updated = [image for image in list(self._images) if image._advance(self._last_tick + self._coalesce_delay)]
+        if updated:
+            self._root.after_idle(lambda: [image._prerender_next() for image in updated if image.get_animation_state()])
+        self._schedule()
+
+
+_clock = _AnimationClock()
+
+
+def set_max_frame_rate(frame_rate: float | None):
+    """Limits the number of times per second the animations are updated (all the animations are updated at the same time), the frames that cannot be shown are skipped
+
+    :param frame_rate: maximum number of updates per second, None for no limit (default)
+    """
+    if frame_rate is not None and frame_rate <= 0:
+        raise ValueError(f"frame_rate should be positive, not {frame_rate}")
+    _clock.max_frame_rate = frame_rate
+    _clock._cancel()
+    _clock._schedule()
+
+
+def get_max_frame_rate() -> float | None:
+    """Returns the maximum number of times per second the animations are updated
+
+    :return: maximum frame rate, None if there is no limit
+    """
+    return _clock.max_frame_rate
+
+
 class AnimatedImage(ctk.CTkImage):
+    _photo_memory = 16 * 1024 * 1024  # bytes of PhotoImages kept for each of the light and dark images, the oldest ones are deleted beyond it
+
     def __init__(self,
                  light_image: Image.Image | str = None,
                  dark_image: Image.Image | str = None,
                  size: Tuple[int, int] = (20, 20),
-                 speed_multiplier=1.
+                 speed_multiplier=1.,
+                 stream_window: int = None
                  ):
         """Image object functioning like CTkImage but allows to animate Images sequences (FLI/FLC, GIF)
 
+        The frames are decoded once in a background thread and their PhotoImages are created before they are shown, the given images should not be used (seek) afterward.
+        The PhotoImages of the last shown frames are kept (up to 16 MB for each of the light and dark images), so short animations are only resized once.
+
         :param light_image: PIL.Image.Image (FLI/FLC or GIF format) or path to image for light mode
         :param dark_image: PIL.Image.Image (FLI/FLC or GIF format) or path to image for dark mode
         :param size: tuple (<width>, <height>) with display size for both images
         :param speed_multiplier: allows to change the speed of the animation: below 1 speeds the animation up and above 1 slows the animation down
+        :param stream_window: Optional: if given, only this number of frames (starting from the shown frame) are kept decoded, the next frames are decoded in advance and the previous ones are released (for very long animations). All the frames are kept otherwise
         """
+        if stream_window is not None and stream_window < 2:
+            raise ValueError(f"stream_window should be at least 2 frames, not {stream_window}")
         if type(light_image) is str:
             if os.path.isfile(light_image):
                 light_image = Image.open(light_image)
@@ -31,33 +384,107 @@ class AnimatedImage(ctk.CTkImage):
 
         super().__init__(light_image, dark_image, size)
 
+        self._stream_window = stream_window
+        self._light_store = None
+        self._dark_store = None
+        self._store_finalizers = {}  # store: finalizer stopping its background thread, called by close() or when the AnimatedImage is garbage collected
+        self._create_stores()
+        self._frame = 0  # index of the shown frame
+        self._rendered = set()  # (light (True) / dark (False), scaled size) of the PhotoImages used by the widgets
         self._currently_animating = False
-        self._time_between_frames = 0
         self._speed_multiplier = speed_multiplier
         self.reset_after_complete = False
+        self._deadline = 0.  # monotonic time at which the shown frame should be replaced by the next one
+        self._paused_at = None  # monotonic time at which the animation was paused because its widgets were not shown, None if it is not paused
+        self._shown_times = deque(maxlen=30)  # monotonic times at which the last frames were shown, used to compute the frame rate
+        self._dropped_frames = 0  # number of frames skipped since the start of the animation
+        self._waiting_delay = 0.01  # time (in s) between 2 checks when the next frame is not decoded yet
 
         # New keys of the dicts self._scaled_light_photo_images and self._scaled_dark_photo_images:
         # ((size_x, size_y), frame_index)
 
+    def _create_store(self, image: Image.Image) -> _FrameStore | _StreamStore:
+        """ Internal method: returns the store decoding the frames of the given image, its background thread is stopped when the AnimatedImage is garbage collected """
+        store = _StreamStore(image, self._stream_window) if self._stream_window is not None else _FrameStore(image)
+        self._store_finalizers[store] = weakref.finalize(self, store.stop)  # the thread only references the store, not the AnimatedImage
+        return store
+
+    def _create_stores(self):
+        """ Internal method: creates the missing stores of the images, the light and dark images share their store if they are the same PIL image (it cannot be read by two threads) """
+        if self._light_store is None and self._light_image is not None:
+            shared = self._dark_image is self._light_image and self._dark_store is not None
+            self._light_store = self._dark_store if shared else self._create_store(self._light_image)
+        if self._dark_store is None and self._dark_image is not None:
+            self._dark_store = self._light_store if self._dark_image is self._light_image else self._create_store(self._dark_image)
+
+    def _main_store(self) -> _FrameStore | _StreamStore:
+        """ Internal method: returns the frames setting the pace of the animation (light image if given) """
+        return self._light_store if self._light_store is not None else self._dark_store
+
+    @staticmethod
+    def _store_index(store: _FrameStore | _StreamStore, frame: int) -> int:
+        """ Internal method: returns the index of the frame of the given store shown at the given frame, waits for the frame if it is not decoded yet (the light and dark images can have a different number of frames) """
+        if store.count is not None:
+            frame %= store.count
+        if not store.available(frame) and not store.wait_for(frame):  # the image has less frames, its number of frames is known now
+            frame %= store.count
+            store.wait_for(frame)
+        return frame
+
+    def _get_photo_image(self, light: bool, scaled_size: Tuple[int, int], frame: int) -> "ImageTk.PhotoImage":
+        """ Internal method: returns the PhotoImage of the given frame, it is created if it does not exist yet """
+        store, photo_images = (self._light_store, self._scaled_light_photo_images) if light else (self._dark_store, self._scaled_dark_photo_images)
+        index = self._store_index(store, frame)
+        if (scaled_size, index) not in photo_images:
+            photo_images[(scaled_size, index)] = ImageTk.PhotoImage(store.resized_frame(index, scaled_size))
+            self._release_photo_images(store, photo_images, index)
+        self._rendered.add((light, scaled_size))
+        return photo_images[(scaled_size, index)]
+
+    def _release_photo_images(self, store: _FrameStore | _StreamStore, photo_images: dict, created: int):
+        """ Internal method: deletes the oldest PhotoImages of the given dict while they use more than _photo_memory bytes, the PhotoImages of the shown frame and of the created one are kept """
+        memory = sum(size[0] * size[1] * 4 for size, index in photo_images)
+        if memory <= self._photo_memory:
+            return
+        shown = self._frame % store.count if store.count is not None else self._frame
+        for key in [key for key in photo_images if key[1] not in (shown, created)]:  # in creation order
+            del photo_images[key]
+            memory -= key[0][0] * key[0][1] * 4
+            if memory <= self._photo_memory:
+                break
+
     def _get_scaled_light_photo_image(self, scaled_size: Tuple[int, int]) -> "ImageTk.PhotoImage":
-        if (scaled_size, self._light_image.tell()) in self._scaled_light_photo_images:
-            return self._scaled_light_photo_images[(scaled_size, self._light_image.tell())]
-        else:
-            self._scaled_light_photo_images[(scaled_size, self._light_image.tell())] = ImageTk.PhotoImage(self._light_image.resize(scaled_size))
-            return self._scaled_light_photo_images[(scaled_size, self._light_image.tell())]
+        return self._get_photo_image(True, scaled_size, self._frame)
 
     def _get_scaled_dark_photo_image(self, scaled_size: Tuple[int, int]) -> "ImageTk.PhotoImage":
-        if (scaled_size, self._dark_image.tell()) in self._scaled_dark_photo_images:
-            return self._scaled_dark_photo_images[(scaled_size, self._dark_image.tell())]
-        else:
-            self._scaled_dark_photo_images[(scaled_size, self._dark_image.tell())] = ImageTk.PhotoImage(self._dark_image.resize(scaled_size))
-            return self._scaled_dark_photo_images[(scaled_size, self._dark_image.tell())]
+        return self._get_photo_image(False, scaled_size, self._frame)
+
+    def _prerender(self, frame: int):
+        """ Internal method: creates the PhotoImages of the given frame for the sizes used by the widgets, so showing it only swaps the images """
+        for light, scaled_size in list(self._rendered):
+            self._get_photo_image(light, scaled_size, frame)
 
     def configure(self, **kwargs):
         if "speed_multiplier" in kwargs:
             self._speed_multiplier = kwargs.pop("speed_multiplier")
-            time_between_2_frames = self._light_image.info["duration"] if self._light_image is not None else self._dark_image.info["duration"]
-            self._time_between_frames = int(time_between_2_frames * self._speed_multiplier)
+        # the frames of the new images are decoded before the widgets are updated
+        main_store = self._main_store()
+        old_stores = {self._light_store, self._dark_store}
+        if "light_image" in kwargs:
+            self._light_image = kwargs.pop("light_image")
+            self._light_store = None
+            self._scaled_light_photo_images = {}
+        if "dark_image" in kwargs:
+            self._dark_image = kwargs.pop("dark_image")
+            self._dark_store = None
+            self._scaled_dark_photo_images = {}
+        self._create_stores()
+        for store in old_stores - {None, self._light_store, self._dark_store}:  # a store shared with the kept image keeps decoding
+            self._store_finalizers.pop(store)()  # stops the store and releases it
+        self._check_images()
+        if self._main_store() is not main_store:  # the new animation starts from its first frame
+            self._frame = 0
+        self._rendered = set()
 
         super().configure(**kwargs)
 
@@ -67,25 +494,87 @@ class AnimatedImage(ctk.CTkImage):
         else:
             return super().cget(attribute_name)
 
-    def _next_frame(self):
-        """ Internal func: changes the current frame to the next one"""
-        if self._currently_animating:
-            try:  # light image
-                if self._light_image is not None:
-                    self._light_image.seek(self._light_image.tell() + 1)
-            except EOFError:
-                self._light_image.seek(0)
+    def _frame_time(self, store: _FrameStore | _StreamStore, frame: int) -> float:
+        """ Internal method: returns the time (in s) the given frame is shown, at least 1ms """
+        return max(store.duration(frame) * self._speed_multiplier, 1) / 1000
+
+    def _widgets(self) -> list[tkinter.Misc]:
+        """ Internal method: returns the existing widgets using the image, the callbacks of the destroyed widgets are removed """
+        widgets = []
+        for callback in list(self._configure_callback_list):
+            widget = getattr(callback, "__self__", None)
+            if isinstance(widget, tkinter.Misc):
+                try:
+                    exists = widget.winfo_exists()
+                except tkinter.TclError:
+                    exists = False
+                if exists:
+                    widgets.append(widget)
+                else:
+                    self._configure_callback_list.remove(callback)
+        return widgets
 
-            try:  # dark image
-                if self._dark_image is not None:
-                    self._dark_image.seek(self._dark_image.tell() + 1)
-            except EOFError:
-                self._dark_image.seek(0)
+    def _next_time(self, now: float, paused_delay: float) -> float:
+        """ Internal method: returns the monotonic time at which the animation should be updated, the paused animations are checked every paused_delay seconds """
+        return self._deadline if self._paused_at is None else now + paused_delay
 
-            for callback in self._configure_callback_list:
-                callback()
+    def _advance(self, now: float) -> bool:
+        """Internal method called by the clock: shows the frame that should be shown at the given monotonic time
+
+        The times at which the frames should be shown are computed from the start of the animation, so the animation does not drift.
+        If the program was late, the frames that should have been shown since the last update are skipped (dropped).
+        The time of the animation stops while none of its widgets is shown (the widget and its masters are mapped).
+        Once the last widgets using the image are destroyed, the animation is removed from the clock until a new widget uses it.
+
+        :param now: current monotonic time
+        :return: True if a new frame is shown
+        """
+        callbacks = len(self._configure_callback_list)
+        widgets = self._widgets()
+        if not any(widget.winfo_viewable() for widget in widgets):
+            if self._paused_at is None:
+                self._paused_at = now
+            if not widgets and len(self._configure_callback_list) < callbacks:  # the last widgets were destroyed
+                _clock.unregister(self)
+            return False
+        if self._paused_at is not None:  # the animation continues where it was paused
+            self._deadline += now - self._paused_at
+            self._paused_at = None
 
-            self._configure_callback_list[0].__self__.after(self._time_between_frames, self._next_frame)
+        store = self._main_store()
+        frame, skipped = self._frame, -1
+        while now >= self._deadline:
+            next_index = store.next_index(frame)
+            if next_index is None:  # the next frame is not decoded yet, the animation waits for it
+                self._deadline = now + self._waiting_delay
+                break
+            frame = next_index
+            skipped += 1
+            self._deadline += self._frame_time(store, frame)
+        if frame == self._frame:
+            return False
+        self._dropped_frames += skipped
+        self._shown_times.append(now)
+        self._show_frame(frame)
+        return True
+
+    def _prerender_next(self):
+        """ Internal method: creates the PhotoImages of the next frame if it is decoded """
+        following = self._main_store().next_index(self._frame)
+        if following is not None:
+            self._prerender(following)
+
+    def _show_frame(self, frame: int):
+        """ Internal method: shows the given frame, in streaming mode the windows of the images are moved to it and the PhotoImages of the released frames are deleted """
+        self._frame = frame
+        for callback in self._configure_callback_list:
+            callback()
+        if self._stream_window is not None:
+            for store, photo_images in ((self._light_store, self._scaled_light_photo_images), (self._dark_store, self._scaled_dark_photo_images)):
+                if store is not None:
+                    store.advance(self._store_index(store, frame))
+                    for key in [key for key in photo_images if not store.in_window(key[1])]:
+                        del photo_images[key]
 
     def get_animation_state(self) -> bool:
         """Returns information about the animation
@@ -94,23 +583,55 @@ class AnimatedImage(ctk.CTkImage):
         """
         return self._currently_animating
 
+    def get_frame_rate(self) -> float:
+        """Returns the number of frames shown per second, computed from the last frames shown
+
+        :return: frame rate, 0 if less than 2 frames were shown since the start of the animation
+        """
+        if len(self._shown_times) < 2 or self._shown_times[-1] == self._shown_times[0]:
+            return 0.
+        return (len(self._shown_times) - 1) / (self._shown_times[-1] - self._shown_times[0])
+
+    def get_dropped_frames(self) -> int:
+        """Returns the number of frames skipped to keep the speed of the animation because the program was late
+
+        :return: number of frames skipped since the start of the animation
+        """
+        return self._dropped_frames
+
+    def add_configure_callback(self, callback):
+        super().add_configure_callback(callback)
+        if self._currently_animating:  # the clock may have been waiting for a widget
+            _clock.register(self)
+
     def start_animation(self):
-        """ Starts the animation loop """
+        """ Starts the animation, it is updated by the clock shared by all the animations (see set_max_frame_rate) while one of its widgets is shown """
         self._currently_animating = True
-        time_between_2_frames = self._light_image.info["duration"] if self._light_image is not None else self._dark_image.info["duration"]
-        self._time_between_frames = int(time_between_2_frames * self._speed_multiplier)
-        self._next_frame()
+        self._shown_times.clear()
+        self._dropped_frames = 0
+        self._deadline = time.monotonic()  # the next frame is shown at the next update
+        self._paused_at = None
+        _clock.register(self)
 
     def stop_animation(self):
         """ Stops the animation loop """
         if self._currently_animating:
             self._currently_animating = False
+            _clock.unregister(self)
             if self.reset_after_complete:
                 self.set_to_frame(0)
                 self.reset_after_complete = False
         else:
             raise RuntimeError("Tried to stop the animation but it was not already running")
 
+    def close(self):
+        """ Stops the animation and the background threads decoding the frames, the image should not be shown afterward (the threads are also stopped when the image is garbage collected) """
+        if self._currently_animating:
+            self.stop_animation()
+        for finalizer in self._store_finalizers.values():
+            finalizer()
+        self._store_finalizers = {}
+
     def start_animation_for(self, ms: int, reset_after_complete=False):
         """Starts the animation and stops automatically after the given time
 
@@ -130,9 +651,6 @@ class AnimatedImage(ctk.CTkImage):
 
         :param frame_index: frame index to set the animation to (1st frame is index 0)
         """
-        if self._light_image is not None:
-            self._light_image.seek(frame_index)
-        if self._dark_image is not None:
-            self._dark_image.seek(frame_index)
-        for callback in self._configure_callback_list:
-            callback()
+        if frame_index < 0 or not self._main_store().wait_for(frame_index):
+            raise ValueError(f"The animation has no frame {frame_index}")
+        self._show_frame(frame_index)
@@ -0,0 +1,104 @@
+"""
+This file contains the registry of the images bundled with the widgets, each image is decoded once per process and shared by all the widgets
+"""
+
+import customtkinter as ctk
+import os
+import threading
+import tkinter
+from PIL import Image, ImageOps
+
+_images_directory = os.path.join(os.path.dirname(__file__), "Images")
+_derived_images = {"forward_arrow_light": ("back_arrow_light", ImageOps.mirror),  # name: (name of the source image, transformation)
+                   "forward_arrow_dark": ("back_arrow_dark", ImageOps.mirror)}
+_pil_images = {}  # name: decoded PIL image
+_ctk_images = {}  # (light name, dark name, size): shared CTkImage
+_lock = threading.RLock()  # the images can be preloaded in a background thread
+
+
+class _SharedCTkImage(ctk.CTkImage):
+    """CTkImage shared by several widgets, its scaled PhotoImages are created once per (size, scaling, appearance mode) for all of them
+
+    A shared image cannot be configured, so the widgets using it are not registered (CTkImage would keep them in memory after their destruction)
+    The PhotoImages belong to the Tk root window that existed when they were created, they are created again if the root window changed (ex: a new CTk window after the first one was destroyed)
+    """
+
+    def __init__(self, light_image: Image.Image, dark_image: Image.Image, size: tuple[int, int]):
+        super().__init__(light_image, dark_image, size)
+        self._root = None  # Tk root window of the scaled PhotoImages
+
+    def create_scaled_photo_image(self, widget_scaling: float, appearance_mode: str):
+        root = getattr(tkinter, "_default_root", None)
+        if root is not self._root:  # the PhotoImages of the previous root window do not exist in the new one
+            self._scaled_light_photo_images = {}
+            self._scaled_dark_photo_images = {}
+            self._root = root
+        return super().create_scaled_photo_image(widget_scaling, appearance_mode)
+
+    def add_configure_callback(self, callback):
+        pass
+
+    def remove_configure_callback(self, callback):
+        pass
+
+    def configure(self, **kwargs):
+        raise ValueError("A shared image cannot be configured, please create a new CTkImage")
+
+
+def image_names() -> list[str]:
+    """Returns the names of the bundled images
+
+    :return: names of the images (file names without extension)
+    """
+    names = {os.path.splitext(file)[0] for file in os.listdir(_images_directory) if file.endswith(".png")}
+    return sorted(names | set(_derived_images))
+
+
+def get_image(name: str) -> Image.Image:
+    """Returns the bundled image with the given name, the image is decoded at the first call only
+
+    :param name: name of the image (file name without extension, ex: "folder_light")
+    :return: shared PIL image, it should not be modified
+    """
+    with _lock:
+        if name not in _pil_images:
+            if name in _derived_images:
+                source, transformation = _derived_images[name]
+                _pil_images[name] = transformation(get_image(source))
+            else:
+                path = os.path.join(_images_directory, f"{name}.png")
+                if not os.path.isfile(path):
+                    raise ValueError(f"Unknown image: {name}")
+                with Image.open(path) as image:
+                    _pil_images[name] = image.copy()  # decodes the image and closes the file
+        return _pil_images[name]
+
+
+def get_ctk_image(light_name: str, dark_name: str = None, size: tuple[int, int] = (20, 20)) -> ctk.CTkImage:
+    """Returns the CTkImage of the given bundled images, the same CTkImage is returned for the same arguments
+
+    :param light_name: name of the image used in light mode
+    :param dark_name: name of the image used in dark mode, None to use the light image
+    :param size: size of the image
+    :return: shared CTkImage, it cannot be configured
+    """
+    dark_name = dark_name if dark_name is not None else light_name
+    key = (light_name, dark_name, tuple(size))
+    with _lock:
+        if key not in _ctk_images:
+            _ctk_images[key] = _SharedCTkImage(get_image(light_name), get_image(dark_name), tuple(size))
+        return _ctk_images[key]
+
+
+def preload(names: list[str] = None, background: bool = False):
+    """Decodes the bundled images so the first widgets using them are created faster
+
+    :param names: names of the images to decode, None to decode all of them
+    :param background: if set to True, the images are decoded in a background thread
+    """
+    names = list(names) if names is not None else image_names()
+    if background:
+        threading.Thread(target=preload, args=(names,), daemon=True).start()
+    else:
+        for name in names:
+            get_image(name)
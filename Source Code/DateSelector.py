@@ -5,10 +5,10 @@ This file contains the Calendar and DateSelector widgets
 import customtkinter as ctk
 import tkinter as tk
 import datetime
-import os
-from PIL import Image
 from typing import Literal, Optional, Union, Tuple, Callable
 
+from .Assets import get_ctk_image
+
 
 def week_days_list_when_week_starts_with(weekday: Literal["mon", "tue", "wed", "thu", "fri", "sat", "sun"]) -> list[str]:
     """ Returns the list of the days of the week starting with the given day """
@@ -240,8 +240,8 @@ class DateSelector(ctk.CTkFrame):
         else:
             raise ValueError(f"The given callback is not callable: {callback}")
 
-        self.back_arrow_image = ctk.CTkImage(Image.open(os.path.join(os.path.dirname(__file__), "Images/back_arrow_light.png")), Image.open(os.path.join(os.path.dirname(__file__), "Images/back_arrow_dark.png")))
-        self.forward_arrow_image = ctk.CTkImage(Image.open(os.path.join(os.path.dirname(__file__), "Images/forward_arrow_light.png")), Image.open(os.path.join(os.path.dirname(__file__), "Images/forward_arrow_dark.png")))
+        self.back_arrow_image = get_ctk_image("back_arrow_light", "back_arrow_dark")
+        self.forward_arrow_image = get_ctk_image("forward_arrow_light", "forward_arrow_dark")
 
         self.top_frame = ctk.CTkFrame(self, fg_color=self._fg_color)
         self.back_button = ctk.CTkButton(self.top_frame, text="", image=self.back_arrow_image, command=self._back, fg_color=self._fg_color, border_color=self._border_color, border_width=2, width=30)
@@ -4,21 +4,233 @@ This file contains custom messagebox / simpledialog for the APY! launcher
 
 import customtkinter as ctk
 import os
+import bisect
+import hashlib
+import heapq
+import tempfile
+import time
+import tkinter
+from array import array
+from collections import OrderedDict, deque
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from typing import Literal, Optional, Union, Tuple
 
 from .Message import showwarning
 from .AskValue import askstring
+from .Assets import get_ctk_image
+from .FileSystems import FileSystem, LocalFileSystem, join_paths  # join_paths stays importable from this module
+from .Matching import match_score
+from .VirtualRows import RowPool, bind_mousewheel
+try:
+    import inotify_simple
+    inotify_activated = True
+except ModuleNotFoundError:
+    inotify_activated = False
 
 
-def join_paths(path: str, *paths: str) -> str:
-    """Joins the given paths and returns the joined path
+def format_size(size: int) -> str:
+    """Returns the given size in a readable format
 
-    :param path: first path to join
-    :param paths: other paths to add
-    :return: final path
+    :param size: size in bytes
+    :return: size with its unit (ex: "1.5 MB"), "" if the size is negative (unknown)
     """
-    return os.path.join(path, *paths).replace("\\", "/")
+    if size < 0:
+        return ""
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if size < 1024 or unit == "TB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def normalize_directory(path: str) -> str:
+    """Returns the given directory path with "/" as separator and without trailing separator, so a directory always gives the same cache key
+
+    :param path: path of a directory
+    :return: normalized path, the roots ("/", "C:/") keep their separator
+    """
+    path = path.replace("\\", "/")
+    stripped = path.rstrip("/")
+    if stripped == "" or stripped.endswith(":"):  # root of the file system or of a drive
+        return stripped + "/"
+    return stripped
+
+
+class _Listing:
+    def __init__(self):
+        """ Items of a directory stored in parallel arrays, in the order they are shown """
+        self.names = []
+        self.folded_names = []  # case-folded names, computed once for the sort keys
+        self.kinds = bytearray()  # 1 for the directories, 0 for the files
+        self.sizes = array("q")  # -1 if unknown
+        self.mtimes = array("d")  # -1 if unknown
+        self.sort_column = None  # column used to sort the items, None if the items are not sorted
+        self.reverse = False
+        self._keys = []  # precomputed sort keys of the items for self.sort_column
+        self._name_index = None  # (sorted case-folded names, indexes of the items), built when a prefix is searched
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index: int | slice) -> tuple[str, bool] | list[tuple[str, bool]]:
+        """ Returns the (name, is_directory) of the item(s) at the given index / slice """
+        if isinstance(index, slice):
+            return list(zip(self.names[index], map(bool, self.kinds[index])))
+        return self.names[index], bool(self.kinds[index])
+
+    def __iter__(self):
+        return zip(self.names, map(bool, self.kinds))
+
+    def _key(self, index: int):
+        """ Returns the sort key of the item at the given index for self.sort_column """
+        if self.sort_column == "size":
+            return self.sizes[index], self.folded_names[index]
+        elif self.sort_column == "date":
+            return self.mtimes[index], self.folded_names[index]
+        return self.folded_names[index]
+
+    def append(self, name: str, is_directory: bool, size: int = -1, mtime: float = -1.):
+        """ Adds the given item at the end of the listing, the listing is not sorted anymore """
+        self.names.append(name)
+        self.folded_names.append(name.casefold())
+        self.kinds.append(is_directory)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.sort_column = None
+        self._keys = []
+        self._name_index = None
+
+    def sort(self, column: str, reverse: bool = False) -> list[int]:
+        """Sorts the items by the given column ("name", "size" or "date"), the directories stay before the files
+
+        :return: old indexes of the items in their new order
+        """
+        self.sort_column, self.reverse = column, reverse
+        if column == "size":
+            self._keys = list(zip(self.sizes, self.folded_names))
+        elif column == "date":
+            self._keys = list(zip(self.mtimes, self.folded_names))
+        else:
+            self._keys = self.folded_names[:]
+        order = sorted(range(len(self.names)), key=self._keys.__getitem__, reverse=reverse)
+        order = [index for index in order if self.kinds[index]] + [index for index in order if not self.kinds[index]]
+        self.keep(order)
+        return order
+
+    def keep(self, indexes: list[int]):
+        """ Keeps only the items at the given indexes, in the given order """
+        self.names = [self.names[index] for index in indexes]
+        self.folded_names = [self.folded_names[index] for index in indexes]
+        self.kinds = bytearray(self.kinds[index] for index in indexes)
+        self.sizes = array("q", (self.sizes[index] for index in indexes))
+        self.mtimes = array("d", (self.mtimes[index] for index in indexes))
+        if self.sort_column is not None:
+            self._keys = [self._keys[index] for index in indexes]
+        self._name_index = None
+
+    def insert(self, name: str, is_directory: bool, size: int = -1, mtime: float = -1.) -> int:
+        """ Inserts the given item at its place in the sorted listing (at the end if the listing is not sorted), returns its index """
+        if self.sort_column is None:
+            self.append(name, is_directory, size, mtime)
+            return len(self.names) - 1
+
+        # binary search of the position in the group of the item (directories / files)
+        directories = self.kinds.count(1)
+        low, high = (0, directories) if is_directory else (directories, len(self.names))
+        self.folded_names.append(name.casefold())  # temporary, to compute the key
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        key = self._key(len(self.names))
+        del self.folded_names[-1], self.sizes[-1], self.mtimes[-1]
+        while low < high:
+            middle = (low + high) // 2
+            if (self._keys[middle] >= key) if self.reverse else (self._keys[middle] <= key):
+                low = middle + 1
+            else:
+                high = middle
+        self.names.insert(low, name)
+        self.folded_names.insert(low, name.casefold())
+        self.kinds.insert(low, is_directory)
+        self.sizes.insert(low, size)
+        self.mtimes.insert(low, mtime)
+        self._keys.insert(low, key)
+        self._name_index = None
+        return low
+
+    def find_prefix(self, prefix: str) -> int:
+        """ Returns the index of the first item (in alphabetical order) whose case-folded name starts with the given case-folded prefix, -1 if no item matches """
+        if self._name_index is None:
+            order = sorted(range(len(self.names)), key=self.folded_names.__getitem__)
+            self._name_index = ([self.folded_names[index] for index in order], order)
+        names, order = self._name_index
+        position = bisect.bisect_left(names, prefix)
+        if position < len(names) and names[position].startswith(prefix):
+            return order[position]
+        return -1
+
+
+class _FilenameIndex:
+    def __init__(self, max_entries: int, max_characters: int):
+        """Index of the items under a directory, filled by a background thread and searched from the tkinter thread
+
+        :param max_entries: maximum number of items in the index
+        :param max_characters: maximum number of characters of all the paths in the index (limits the memory used)
+        """
+        self.items = []  # (relative path, case-folded name, is_directory)
+        self.complete = False  # True when the whole directory was indexed
+        self.truncated = False  # True if the indexing stopped because of the limits
+        self._max_entries = max_entries
+        self._max_characters = max_characters
+        self._characters = 0
+
+        # last query, its results are refined by the next queries starting with it
+        self._query = None
+        self._candidates = []  # (score, path length, index) of the items matching self._query
+        self._searched = 0  # number of items searched for self._query
+        self._best = []  # best candidates of the last search, sorted
+        self._limit = 0  # number of results of the last search
+
+    def add(self, path: str, name: str, is_directory: bool) -> bool:
+        """ Adds the given item to the index, returns False if the index is full """
+        if len(self.items) >= self._max_entries or self._characters + len(path) > self._max_characters:
+            self.truncated = True
+            return False
+        self._characters += len(path)
+        self.items.append((path, name.casefold(), is_directory))
+        return True
+
+    def search(self, query: str, limit: int) -> list[tuple[str, bool]]:
+        """Returns the (relative path, is_directory) of the best matches of the given query, see match_score
+
+        The items matching the last query are reused if the new query starts with it, only the items added since are searched entirely
+        """
+        query = query.casefold()
+        count = len(self.items)  # items can be added by the indexing thread during the search
+        refined = self._query is not None and query.startswith(self._query)  # the items matching query are in the last candidates or were added since
+        new_candidates = []
+        for index in range(self._searched if refined else 0, count):
+            score = match_score(query, self.items[index][1])
+            if score is not None:
+                new_candidates.append((score, len(self.items[index][0]), index))
+        if query == self._query and limit == self._limit:
+            # only the items added since the last search can enter the best results
+            candidates = self._candidates + new_candidates
+            best = heapq.nsmallest(limit, self._best + new_candidates)
+        else:
+            if refined:
+                candidates = []
+                for score, length, index in self._candidates:
+                    score = match_score(query, self.items[index][1])
+                    if score is not None:
+                        candidates.append((score, length, index))
+                candidates += new_candidates
+            else:
+                candidates = new_candidates
+            best = heapq.nsmallest(limit, candidates)
+        self._query, self._candidates, self._searched, self._best, self._limit = query, candidates, count, best, limit
+        return [(self.items[index][0], self.items[index][2]) for score, length, index in best]
 
 
 class FileExplorer(ctk.CTkFrame):
@@ -30,6 +242,16 @@ class FileExplorer(ctk.CTkFrame):
                  filetypes: list[str] = None,
                  initialdir: str = None,
                  initialfile: str = None,
+                 virtualized: bool = False,
+                 cache_size: int = 10,
+                 watch: bool = False,
+                 search: bool = False,
+                 thumbnails: bool = False,
+                 thumbnail_cache_dir: str = None,
+                 columns: list[Literal["size", "date"]] = None,
+                 sort_by: Literal["name", "size", "date"] = "name",
+                 file_system: FileSystem = None,
+                 folder_sizes: bool = False,
 
                  # customtkinter frame parameters
                  width: int = 200,
@@ -48,20 +270,38 @@ class FileExplorer(ctk.CTkFrame):
 
         :param responsetype: type of the path to select ("file" / "directory")
         :param filetypes: extensions of the files that can be selected (ex: [".txt", ".csv"]), None if a directory should be selected or if all files can be selected
-        :param initialdir: directory to start the selection from, if both initialdir and initialfile are None, the initialdir will be os.getcwd()
+        :param initialdir: directory to start the selection from, if both initialdir and initialfile are None, the initialdir will be the current directory of the file system
         :param initialfile: path of the file selected at the start of the search
+        :param virtualized: if set to True, only the visible rows are created as widgets and are recycled while scrolling (recommended for directories with a lot of items)
+        :param cache_size: maximum number of directories kept in memory (with their scrolling position) to be shown again instantly if they did not change, 0 disables the cache
+        :param watch: if set to True, the shown directory is watched (using inotify for the local file system if the inotify_simple package is installed, by polling otherwise) and the changes are applied to the rows without refilling the explorer
+        :param search: if set to True, a search bar is added to find the items in all the subdirectories of the shown directory
+        :param thumbnails: if set to True, the image files show a preview of the image instead of the file icon (only the visible rows are loaded, in background threads)
+        :param thumbnail_cache_dir: directory where the thumbnails are saved to be loaded faster the next times, default is a directory in the temporary files directory. The least recently used thumbnails are deleted beyond 10000 files
+        :param columns: columns shown next to the names of the items ("size" / "date"), if not None a header is added to sort the items by clicking on the columns
+        :param sort_by: column used to sort the items ("name" / "size" / "date"), the directories are always shown before the files
+        :param file_system: file system to browse (ex: ArchiveFileSystem to select the items of a zip / tar archive), default is LocalFileSystem
+        :param folder_sizes: if set to True, the size column (added if needed) also shows the total size of the directories, computed in background threads
         """
+        if file_system is None:
+            file_system = LocalFileSystem()
         # checking arguments
         if responsetype not in ["file", "directory"]:
             raise ValueError(f"responsetype should be \"file\" or \"directory\", not {responsetype}")
         if initialdir is not None and initialfile is not None:
             raise ValueError(f"Cannot use initialdir and initialfile at the same time, please set only one")
-        if initialdir is not None and not os.path.isdir(initialdir):
+        if initialdir is not None and not file_system.isdir(initialdir):
             raise ValueError(f"Path of initialdir is unknown: {initialdir}")
+        if columns is not None and any(column not in ["size", "date"] for column in columns):
+            raise ValueError(f"columns should only contain \"size\" or \"date\", not {columns}")
+        if sort_by not in ["name", "size", "date"]:
+            raise ValueError(f"sort_by should be \"name\", \"size\" or \"date\", not {sort_by}")
+        if type(cache_size) is not int or cache_size < 0:
+            raise ValueError(f"cache_size should be a positive int, not {cache_size}")
         if initialfile is not None:
             if responsetype != "file":
                 raise ValueError("Cannot use initialfile is responsetype is directory")
-            if not os.path.isfile(initialfile):
+            if not file_system.isfile(initialfile):
                 raise ValueError(f"Path of initialfile is unknown: {initialfile}")
             if filetypes is not None and initialfile.split(".")[-1] not in filetypes:
                 raise ValueError(f"initialfile extension is not in filetypes: {initialfile.split(".")[-1]}")
@@ -75,12 +315,78 @@ class FileExplorer(ctk.CTkFrame):
         self.grid_columnconfigure(2, weight=0)
         self.grid_columnconfigure(3, weight=0)
         self.grid_rowconfigure(0, weight=0)
-        self.grid_rowconfigure(1, weight=1)
-        self.grid_rowconfigure(2, weight=0)
+        self.grid_rowconfigure(1, weight=0)
+        self.grid_rowconfigure(2, weight=1)
+        self.grid_rowconfigure(3, weight=0)
+        self.grid_rowconfigure(4, weight=0)
 
         self.response_type = responsetype
+        self.file_system = file_system
         self.filetypes = filetypes
         self.change_path = True  # if set to false, the tracing on self.selected_path will be disabled
+        self.virtualized = virtualized
+        self.columns = list(columns) if columns is not None else []
+        if folder_sizes and "size" not in self.columns:
+            self.columns.append("size")
+        self._column_widths = {"size": 80, "date": 120}
+        self._sort_column = sort_by
+        self._sort_reverse = False
+        self._stat_entries = bool(self.columns) or sort_by != "name"  # True if the sizes and modification times of the items are needed
+        self._entries = _Listing()  # items shown in the explorer
+        self._scan_cancel = None  # threading.Event of the running directory scan, None if no scan is running
+        self._scan_results = None  # queue.Queue receiving the batches of items of the running scan
+        self._scan_after_id = None
+        self._scan_batch_size = 256  # number of items sent at once by the scanning thread
+        self._scan_poll_interval = 15  # ms between 2 checks of the scan results
+        self._scan_mtime = None  # mtime of the scanned directory, sent by the scanning thread before the items
+        self._scan_known_mtime = None  # mtime of the cached listing being checked by the running scan, None if the scan is not a check
+        self._shown_path = None  # directory whose items are shown in the explorer
+        self._cache_size = cache_size
+        self._listing_cache = OrderedDict()  # path: {"mtime", "entries", "widgets", "scroll", "frame"}, the last used directory is at the end
+        self._row_widgets = []  # (name label, *column labels) of the rows in self._entries order, only used when not virtualized
+        self.watch = watch
+        self._watch_cancel = None  # threading.Event of the thread watching the shown directory, None if no directory is watched
+        self._watch_results = None  # queue.Queue receiving the changes of the watched directory
+        self._watch_after_id = None
+        self._watch_interval = 1000  # ms between 2 checks of the watched directory when polling
+        self._path_check_delay = 250  # ms without modification of the path entry before the path is checked
+        self._path_check_after_id = None
+        self._path_check_id = 0  # id of the last path check, the results of the older checks are ignored
+        self._completion_count = 8  # maximum number of completions shown under the path entry
+        self.change_search = True  # if set to false, the tracing on self.search_var will be disabled
+        self._searching = False  # True when the explorer shows the results of a search
+        self._search_index = None  # _FilenameIndex of the searched directory
+        self._search_cancel = None  # threading.Event of the indexing thread
+        self._search_after_id = None
+        self._search_delay = 150  # ms without modification of the search bar before the search is updated
+        self._search_poll_interval = 250  # ms between 2 updates of the results while the directory is indexed
+        self._search_result_count = 200  # number of results shown
+        self._search_max_entries = 200000
+        self._search_max_characters = 20000000
+        self.thumbnails = thumbnails
+        self._thumbnail_cache_dir = thumbnail_cache_dir if thumbnail_cache_dir is not None else os.path.join(tempfile.gettempdir(), "MoreCustomTkinterWidgets", "thumbnails")
+        self._thumbnail_size = (20, 20)
+        self._thumbnail_executor = None  # ThreadPoolExecutor decoding the images, created when the first thumbnail is requested
+        self._thumbnail_requests = {}  # path: future of the thumbnails being decoded
+        self._thumbnail_results = queue.Queue()  # (path, PIL image or None) of the decoded thumbnails
+        self._thumbnail_after_id = None
+        self._thumbnail_images = OrderedDict()  # path: CTkImage of the last decoded thumbnails, the last used thumbnail is at the end
+        self._thumbnail_memory_size = 500  # maximum number of thumbnails kept in memory
+        self._thumbnail_cache_files = 10000  # maximum number of thumbnails kept in the cache directory, the least recently used are deleted when the thumbnails start being loaded
+        self._thumbnail_failures = set()  # paths of the files that could not be decoded
+        self.folder_sizes = folder_sizes
+        self._folder_size_executor = None  # ThreadPoolExecutor walking the directories, created when the first size is requested
+        self._folder_size_requests = {}  # path: future of the directory sizes being computed
+        self._folder_size_results = queue.Queue()  # (path, (mtime, size) or None) of the computed directory sizes
+        self._folder_size_cancel = None  # threading.Event stopping the running computations when the user moves to another directory
+        self._folder_size_after_id = None
+        self._folder_size_memory = OrderedDict()  # path: (mtime, size) of the computed directory sizes, the last used size is at the end
+        self._folder_size_memory_size = 10000  # maximum number of directory sizes kept in memory
+        self._selected_name = None  # name of the highlighted row in the shown directory, None if no row is highlighted
+        self._selection_color = ("gray75", "gray30")
+        self._type_ahead = ""  # letters typed by the user to find an item
+        self._type_ahead_time = 0.
+        self._type_ahead_delay = 1.  # s without typing before the typed letters are forgotten
 
         if initialdir is not None:
             self.path_to_show = ctk.StringVar(self, value=initialdir)  # always a directory, path to show in the explorer
@@ -89,12 +395,12 @@ class FileExplorer(ctk.CTkFrame):
             self.path_to_show = ctk.StringVar(self, value=os.path.dirname(initialfile))
             self.selected_path = ctk.StringVar(self, value=initialfile)
         else:
-            self.path_to_show = ctk.StringVar(self, value=os.getcwd())
-            self.selected_path = ctk.StringVar(self, value=os.getcwd())
+            self.path_to_show = ctk.StringVar(self, value=file_system.getcwd())
+            self.selected_path = ctk.StringVar(self, value=file_system.getcwd())
         self.selected_path.trace_add("write", self._user_path_changed)
 
-        self.folder_image = ctk.CTkImage(Image.open(os.path.join(os.path.dirname(__file__), "Images/folder_light.png")), Image.open(os.path.join(os.path.dirname(__file__), "Images/folder_dark.png")))
-        self.file_image = ctk.CTkImage(Image.open(os.path.join(os.path.dirname(__file__), "Images/file_light.png")), Image.open(os.path.join(os.path.dirname(__file__), "Images/file_dark.png")))
+        self.folder_image = get_ctk_image("folder_light", "folder_dark")
+        self.file_image = get_ctk_image("file_light", "file_dark")
 
         self.canvas = ctk.CTkCanvas(self, highlightthickness=0)
         if fg_color == "transparent":
@@ -102,11 +408,12 @@ class FileExplorer(ctk.CTkFrame):
         else:
             self.canvas.configure(bg=self._apply_appearance_mode(self.cget("fg_color")))
 
+        self._explorer_fg_color = fg_color
         self.explorer_frame = ctk.CTkFrame(self.canvas, fg_color=fg_color)
 
-        self.back_button = ctk.CTkButton(self, image=ctk.CTkImage(Image.open(os.path.join(os.path.dirname(__file__), "Images/back_arrow_light.png")), Image.open(os.path.join(os.path.dirname(__file__), "Images/back_arrow_dark.png"))), text="", command=self._move_back, width=35)
+        self.back_button = ctk.CTkButton(self, image=get_ctk_image("back_arrow_light", "back_arrow_dark"), text="", command=self._move_back, width=35)
         self.path_entry = ctk.CTkEntry(self, textvariable=self.selected_path)
-        self.create_dir_button = ctk.CTkButton(self, image=ctk.CTkImage(Image.open(os.path.join(os.path.dirname(__file__), "Images/new_folder_light.png")), Image.open(os.path.join(os.path.dirname(__file__), "Images/new_folder_dark.png"))), text="", command=self._create_directory, width=35)
+        self.create_dir_button = ctk.CTkButton(self, image=get_ctk_image("new_folder_light", "new_folder_dark"), text="", command=self._create_directory, width=35)
         self.y_scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
         self.x_scrollbar = ctk.CTkScrollbar(self, orientation="horizontal", command=self.canvas.xview)
         self.canvas.configure(yscrollcommand=self.y_scrollbar.set)
@@ -115,15 +422,59 @@ class FileExplorer(ctk.CTkFrame):
         self.back_button.grid(row=0, column=0, padx=3, pady=3, sticky="nw")
         self.path_entry.grid(row=0, column=1, padx=3, pady=3, sticky="new")
         self.create_dir_button.grid(row=0, column=2, columnspan=2, padx=3, pady=3, sticky="ne")
-        self.canvas.grid(row=1, column=0, columnspan=3, padx=3, pady=3, sticky="nsew")
-        self.y_scrollbar.grid(row=1, column=3, rowspan=2, sticky="nse")
-        self.x_scrollbar.grid(row=2, column=0, columnspan=3, sticky="sew")
+        self.canvas.grid(row=2, column=0, columnspan=3, padx=3, pady=3, sticky="nsew")
+        self.y_scrollbar.grid(row=2, column=3, rowspan=2, sticky="nse")
+        self.x_scrollbar.grid(row=3, column=0, columnspan=3, sticky="sew")
+
+        self._header_buttons = {}  # column: button of the header
+        if columns is not None or folder_sizes:  # header used to sort the items
+            self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
+            self.header_frame.grid_columnconfigure(0, weight=1)
+            for index, column in enumerate(["name"] + self.columns):
+                self._header_buttons[column] = ctk.CTkButton(self.header_frame, text="", fg_color="transparent", hover_color=("gray80", "gray30"), text_color=ctk.ThemeManager.theme["CTkLabel"]["text_color"],
+                                                             width=self._column_widths.get(column, 0), height=22, anchor="w" if column == "name" else "e", command=lambda c=column: self._header_clicked(c))
+                self._header_buttons[column].grid(row=0, column=index, padx=3, sticky="ew")
+            self._update_header()
+            self.header_frame.grid(row=1, column=0, columnspan=3, padx=3, sticky="ew")
 
-        self.canvas.create_window((1, 1), window=self.explorer_frame, anchor="nw")
+        self.search_var = ctk.StringVar(self)
+        self.search_var.trace_add("write", self._search_modified)
+        if search:
+            self.search_entry = ctk.CTkEntry(self, textvariable=self.search_var)
+            self.search_entry.grid(row=4, column=0, columnspan=4, padx=3, pady=3, sticky="ew")
 
-        self.explorer_frame.bind("<Configure>", self._configure_frame)
-        self.canvas.bind("<MouseWheel>", self._mousewheel)
-        self.explorer_frame.bind("<MouseWheel>", self._mousewheel)
+        self.loading_label = ctk.CTkLabel(self, text="Loading...")  # shown over the canvas while a directory is scanned
+
+        # completions of the path entry, shown under it
+        self.completion_frame = ctk.CTkFrame(self, border_width=1)
+        self._completion_labels = []
+        for index in range(self._completion_count):
+            label = ctk.CTkLabel(self.completion_frame, text="", anchor="w", height=22)
+            label.bind("<Button-1>", lambda event, i=index: self._complete(i))
+            self._completion_labels.append(label)
+        self._completions = []  # paths proposed by the completion labels
+        self.path_entry.bind("<Tab>", lambda event: self._complete(0))
+        self.path_entry.bind("<Escape>", lambda event: self._hide_completions())
+        self.path_entry.bind("<FocusOut>", lambda event: self.after(150, self._hide_completions))  # delayed so the completion labels can be clicked
+
+        if virtualized:
+            # the rows are labels placed directly on the canvas, only the visible ones (+ overscan) exist
+            self._row_height = self._apply_widget_scaling(34)  # label height (28) + vertical padding (2 * 3)
+            self._row_pool = RowPool(self.canvas, self._row_height, self._create_slot, self._draw_slot, self._hide_slot)  # slots: (label, canvas window id, canvas text ids of the columns)
+            self._slot_positions = []  # x coordinates of the columns used to draw the slots
+            self._max_row_width = 0
+            self._column_font = ctk.CTkFont(size=12)
+            self.canvas.configure(yscrollcommand=self._yscroll)
+            self.canvas.bind("<Configure>", lambda event: self._render_visible_rows())
+        else:
+            self._frame_window = self.canvas.create_window((1, 1), window=self.explorer_frame, anchor="nw")
+            self.explorer_frame.bind("<Configure>", self._configure_frame)
+            bind_mousewheel(self.explorer_frame, self.canvas)
+            if thumbnails:
+                self.canvas.configure(yscrollcommand=self._yscroll)  # the thumbnails of the rows becoming visible are requested
+        bind_mousewheel(self.canvas, self.canvas)
+        self.canvas.bind("<Button-1>", lambda event: self.canvas.focus_set())
+        self.canvas.bind("<KeyPress>", self._key_pressed)
 
         self._fill_explorer()
 
@@ -131,9 +482,196 @@ class FileExplorer(ctk.CTkFrame):
         """ Handles the event when self.explorer_frame is configured """
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
-    def _mousewheel(self, event):
-        """ Handles the mousewheel event on the explorer_frame """
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    def _set_explorer_frame(self, frame: ctk.CTkFrame):
+        """ Shows the given frame in the canvas instead of the current explorer_frame (which is not destroyed), the events of the frame are bound when it is created """
+        self.explorer_frame = frame
+        self.canvas.itemconfigure(self._frame_window, window=frame)
+
+    def _yscroll(self, first, last):
+        """ Handles the vertical scrolling of the canvas in virtualized mode or when the thumbnails are shown """
+        self.y_scrollbar.set(first, last)
+        if self.virtualized:
+            self._render_visible_rows()
+        elif self.thumbnails:
+            self._request_thumbnails()
+
+    def _update_scrollregion(self):
+        """ Computes the scrollregion of the canvas from the number of rows in virtualized mode """
+        width = self._column_positions()[-1] if self.columns else max(self._max_row_width, self.canvas.winfo_width())
+        self.canvas.configure(scrollregion=(0, 0, width, len(self._entries) * self._row_height))
+
+    def _column_positions(self) -> list[float]:
+        """ Returns the x coordinates of the right side of the columns in virtualized mode """
+        widths = [self._apply_widget_scaling(self._column_widths[column]) for column in self.columns]
+        x = max(self._max_row_width, self.canvas.winfo_width() - sum(widths) - 6)
+        positions = []
+        for width in widths:
+            x += width
+            positions.append(x)
+        return positions
+
+    def _column_texts(self, index: int) -> list[str]:
+        """ Returns the texts shown in the columns for the item at the given index """
+        texts = []
+        for column in self.columns:
+            if column == "size" and self._entries.kinds[index]:
+                size = self._folder_size_memory.get(self.file_system.join(self._shown_path, self._entries.names[index])) if self.folder_sizes else None
+                texts.append("" if size is None else format_size(size[1]))
+            elif column == "size":
+                texts.append(format_size(self._entries.sizes[index]))
+            else:  # date
+                mtime = self._entries.mtimes[index]
+                texts.append(time.strftime("%d/%m/%Y %H:%M", time.localtime(mtime)) if mtime >= 0 else "")
+        return texts
+
+    def _visible_range(self) -> tuple[int, int]:
+        """ Returns the (first, last + 1) indexes of the visible rows, including the overscan in virtualized mode """
+        if self.virtualized:
+            return self._row_pool.visible_range(len(self._entries))
+        else:  # the rows are sorted by their position in the explorer_frame
+            top = self.canvas.canvasy(0)
+            bottom = top + self.canvas.winfo_height()
+            first = bisect.bisect_left(self._row_widgets, top, key=lambda widgets: widgets[0].winfo_y() + widgets[0].winfo_height())
+            last = bisect.bisect_right(self._row_widgets, bottom, key=lambda widgets: widgets[0].winfo_y())
+            return first, min(last, first + 100)  # the rows are all at y=0 before the first drawing
+
+    def _render_visible_rows(self):
+        """ Shows the visible rows (+ overscan) in virtualized mode by recycling the labels of the pool """
+        self._slot_positions = self._column_positions()
+        self._row_pool.render(len(self._entries))
+        if self.columns and self._column_positions() != self._slot_positions:  # the canvas or the names became wider
+            positions = self._column_positions()
+            for slot, index in self._row_pool.drawn():
+                for text, x in zip(self._row_pool.slots[slot][2], positions):
+                    self.canvas.coords(text, x, (index + 0.5) * self._row_height)
+        if self.thumbnails:
+            self._request_thumbnails()
+
+    def _create_slot(self, slot: int) -> tuple[ctk.CTkLabel, int, list[int]]:
+        """ Creates the hidden (label, canvas window id, canvas text ids of the columns) of a new slot of the pool in virtualized mode """
+        label = ctk.CTkLabel(self.canvas, text="", compound="left", anchor="w")
+        label.bind("<Button-1>", lambda event: self._row_clicked(slot))  # left click
+        label.bind("<Double-Button-1>", lambda event: self._row_double_clicked(slot))  # double left click
+        bind_mousewheel(label, self.canvas)
+        color = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+        texts = [self.canvas.create_text(0, 0, anchor="e", font=self._column_font, fill=color, tags="column", state="hidden") for column in self.columns]
+        return label, self.canvas.create_window(0, 0, window=label, anchor="nw", state="hidden"), texts
+
+    def _draw_slot(self, slot: int, index: int):
+        """ Shows the item at the given index with the given slot of the pool in virtualized mode """
+        label, window, texts = self._row_pool.slots[slot]
+        name, is_directory = self._entries[index]
+        label.configure(text=f"  {name}", image=self._row_image(name, is_directory), fg_color=self._selection_color if name == self._selected_name else "transparent")
+        self.canvas.coords(window, 3, index * self._row_height + 3)
+        self.canvas.itemconfigure(window, state="normal")
+        for text, value, x in zip(texts, self._column_texts(index), self._slot_positions):
+            self.canvas.coords(text, x, (index + 0.5) * self._row_height)
+            self.canvas.itemconfigure(text, text=value, state="normal")
+        if label._label.winfo_reqwidth() + 6 > self._max_row_width:
+            self._max_row_width = label._label.winfo_reqwidth() + 6
+            self._update_scrollregion()
+
+    def _hide_slot(self, slot: int):
+        """ Hides the label and the column texts of the given slot of the pool in virtualized mode """
+        label, window, texts = self._row_pool.slots[slot]
+        self.canvas.itemconfigure(window, state="hidden")
+        for text in texts:
+            self.canvas.itemconfigure(text, state="hidden")
+
+    def _row_clicked(self, slot: int):
+        """ Handles a left click on a label of the pool in virtualized mode """
+        if self._row_pool.rows[slot] != -1:
+            self._select_row(self._row_pool.rows[slot])
+
+    def _row_double_clicked(self, slot: int):
+        """ Handles a double left click on a label of the pool in virtualized mode """
+        if self._row_pool.rows[slot] != -1:
+            name, is_directory = self._entries[self._row_pool.rows[slot]]
+            if is_directory:
+                self._move_to(self.file_system.join(self._shown_path, name))
+
+    def _row_index(self, name: str) -> int:
+        """ Returns the index of the item with the given name in the shown directory, -1 if it is not shown """
+        try:
+            return self._entries.names.index(name)
+        except ValueError:
+            return -1
+
+    def _highlight_row(self, index: int, highlighted: bool):
+        """ Changes the background of the row at the given index, if the row is shown """
+        color = self._selection_color if highlighted else "transparent"
+        if not self.virtualized:
+            self._row_widgets[index][0].configure(fg_color=color)
+        else:
+            slot = self._row_pool.slot_of(index)
+            if slot is not None:
+                self._row_pool.slots[slot][0].configure(fg_color=color)
+
+    def _select_row(self, index: int, scroll: bool = False):
+        """Highlights the row at the given index and selects its path
+
+        :param scroll: if set to True, the explorer is scrolled to show the row
+        """
+        old_index = self._row_index(self._selected_name) if self._selected_name is not None else -1
+        if old_index != -1:
+            self._highlight_row(old_index, False)
+        self._selected_name = self._entries.names[index]
+        self._highlight_row(index, True)
+        self._select(self.file_system.join(self._shown_path, self._selected_name))
+        self.canvas.focus_set()
+        if scroll:
+            self._scroll_to_row(index)
+
+    def _row_bounds(self, index: int) -> tuple[float, float, float]:
+        """ Returns the (top, bottom) y coordinates of the row at the given index and the height of all the rows """
+        if self.virtualized:
+            return index * self._row_height, (index + 1) * self._row_height, len(self._entries) * self._row_height
+        self.explorer_frame.update_idletasks()  # the rows may not be placed yet
+        widget = self._row_widgets[index][0]
+        return widget.winfo_y() - 3, widget.winfo_y() + widget.winfo_height() + 3, self.explorer_frame.winfo_height()
+
+    def _scroll_to_row(self, index: int):
+        """ Scrolls the explorer (without going through the rows) so the row at the given index is visible """
+        top, bottom, height = self._row_bounds(index)
+        visible_top = self.canvas.canvasy(0)
+        visible_height = self.canvas.winfo_height()
+        if height <= 0:
+            return
+        if top < visible_top:
+            self.canvas.yview_moveto(top / height)
+        elif bottom > visible_top + visible_height:
+            self.canvas.yview_moveto(max(0., bottom - visible_height) / height)
+
+    def _page_size(self) -> int:
+        """ Returns the number of rows that fit in the canvas """
+        top, bottom, height = self._row_bounds(0)
+        return max(1, int(self.canvas.winfo_height() // max(1, bottom - top)))
+
+    def _key_pressed(self, event):
+        """Handles a key pressed while the explorer has the focus
+
+        The arrows, Page Up / Page Down, Home and End keys move the selection, Return opens the selected directory and the letters select the first item starting with the typed letters
+        """
+        if len(self._entries) == 0:
+            return
+        index = self._row_index(self._selected_name) if self._selected_name is not None else -1
+        moves = {"Up": index - 1, "Down": index + 1, "Prior": index - self._page_size(), "Next": index + self._page_size(), "Home": 0, "End": len(self._entries) - 1}
+        if event.keysym in moves:
+            self._select_row(min(max(moves[event.keysym] if index != -1 else 0, 0), len(self._entries) - 1), scroll=True)
+            return "break"
+        elif event.keysym == "Return" and index != -1 and self._entries.kinds[index]:
+            self._move_to(self.file_system.join(self._shown_path, self._selected_name))
+            return "break"  # prevents the Filedialog from validating the directory
+        elif event.char.isprintable() and event.char != "" and not event.state & 0x4:  # letters typed without Control
+            now = time.monotonic()
+            if now - self._type_ahead_time > self._type_ahead_delay:
+                self._type_ahead = ""
+            self._type_ahead += event.char.casefold()
+            self._type_ahead_time = now
+            found = self._entries.find_prefix(self._type_ahead)
+            if found != -1:
+                self._select_row(found, scroll=True)
+            return "break"
 
     def _reset_scrolling(self):
         """ Resets the scrolling of the explorer_frame to the beginning """
@@ -155,13 +693,17 @@ class FileExplorer(ctk.CTkFrame):
             name = askstring("Creating directory", f"Enter the name of the directory to create\nThe directory will be created in: {self.path_to_show.get()}", allow_none=False)
             if name is None:
                 break
-            elif os.path.exists(join_paths(self.path_to_show.get(), name)):
+            elif self.file_system.exists(self.file_system.join(self.path_to_show.get(), name)):
                 showwarning("Creating directory", "The given name already exists, please enter another one")
             else:
-                os.mkdir(join_paths(self.path_to_show.get(), name))
-                self.path_to_show.set(join_paths(self.path_to_show.get(), name))
+                try:
+                    self.file_system.mkdir(self.file_system.join(self.path_to_show.get(), name))
+                except OSError as error:
+                    showwarning("Creating directory", f"The directory cannot be created: {error}")
+                    break
+                self.path_to_show.set(self.file_system.join(self.path_to_show.get(), name))
                 self.change_path = False
-                self.selected_path.set(join_paths(self.path_to_show.get()))
+                self.selected_path.set(self.file_system.join(self.path_to_show.get()))
                 self.change_path = True
                 self._empty_explorer()
                 self._fill_explorer()
@@ -183,64 +725,880 @@ class FileExplorer(ctk.CTkFrame):
         self._fill_explorer()
 
     def _empty_explorer(self):
-        """ Empties the explorer_frame """
-        for children in self.explorer_frame.winfo_children():
-            children.destroy()
+        """ Empties the explorer_frame, the items stay in the cache if the directory is cached """
+        self._cancel_scan()
+        self._cancel_folder_sizes()
+        self._selected_name = None
+        cached = None if self._searching else self._listing_cache.get(self._shown_path)
+        if cached is not None:
+            cached["scroll"] = (self.canvas.xview()[0], self.canvas.yview()[0])
+        self._entries = _Listing()
+        self._row_widgets = []
+        self._shown_path = None
+        if self.virtualized:
+            self._row_pool.hide()
+        elif cached is not None and cached["frame"] is self.explorer_frame:  # keeping the widgets of the cached directory
+            frame = ctk.CTkFrame(self.canvas, fg_color=self._explorer_fg_color)
+            frame.bind("<Configure>", self._configure_frame)  # bound once, CTkFrame.bind adds a new handler at each call
+            bind_mousewheel(frame, self.canvas)
+            self._set_explorer_frame(frame)
+        else:
+            for children in self.explorer_frame.winfo_children():
+                children.destroy()
+
+    def _can_be_shown(self, name: str, is_directory: bool) -> bool:
+        """ Returns True if the given item can be shown in the explorer (response type and filetypes) """
+        if is_directory:
+            return True
+        elif not self.response_type == "directory":  # file
+            return self.filetypes is None or self.filetypes is not None and f".{name.split(".")[-1]}" in self.filetypes
+        return False
+
+    def _scan_directory(self, path: str, known_mtime: int | None, stats: bool, cancel_event: threading.Event, results: queue.Queue):
+        """ Internal method executed in a background thread: sends the mtime of the given directory, then scans it and sends the (name, is_directory, size, mtime) of the items that can be shown by batches, None is sent at the end of the scan
+
+        If the mtime is equal to known_mtime, the directory did not change and is not scanned.
+        The size and mtime of the items are only read if stats is True (-1 otherwise).
+        """
+        try:
+            mtime = self.file_system.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        results.put(mtime)
+        if mtime is not None and mtime == known_mtime:
+            results.put(None)
+            return
+
+        batch = []
+        try:
+            with self.file_system.scandir(path) as iterator:
+                for entry in iterator:
+                    if cancel_event.is_set():
+                        return
+                    try:
+                        is_directory = entry.is_dir()  # uses the type information of the DirEntry when available
+                    except OSError:
+                        is_directory = False
+                    if self._can_be_shown(entry.name, is_directory):
+                        batch.append((entry.name, is_directory, *self._entry_stats(entry, stats)))
+                        if len(batch) >= self._scan_batch_size:
+                            results.put(batch)
+                            batch = []
+        except OSError:  # not a directory, permission denied...
+            pass
+        if batch:
+            results.put(batch)
+        results.put(None)
+
+    @staticmethod
+    def _entry_stats(entry: os.DirEntry, stats: bool) -> tuple[int, float]:
+        """ Returns the (size, mtime) of the given DirEntry, (-1, -1) if they cannot be read or if stats is False """
+        if stats:
+            try:
+                result = entry.stat()
+                return result.st_size, result.st_mtime
+            except OSError:
+                pass
+        return -1, -1.
+
+    def _cancel_scan(self):
+        """ Cancels the running directory scan if there is one """
+        if self._scan_cancel is not None:
+            self._scan_cancel.set()
+            self._scan_cancel = None
+            self._scan_results = None
+        if self._scan_after_id is not None:
+            self.after_cancel(self._scan_after_id)
+            self._scan_after_id = None
+        self.loading_label.place_forget()
+        self._stop_watch()
 
     def _fill_explorer(self):
-        """ Fills the explorer_frame with the files at self.path_to_show """
-        row = 0
-        path = self.path_to_show.get()
-        if os.path.isdir(path):
-            for item in os.listdir(path):
-                if os.path.isdir(join_paths(path, item)):  # directory
-                    label = ctk.CTkLabel(self.explorer_frame, text=f"  {item}", compound="left", image=self.folder_image)
-                    label.bind("<Button-1>", lambda event, p=join_paths(path, item): self._select(p))  # left click
-                    label.bind("<Double-Button-1>", lambda event, p=join_paths(path, item): self._move_to(p))  # double left click
-                    label.bind("<MouseWheel>", self._mousewheel)
-                    label.grid(row=row, column=0, sticky="w", padx=3, pady=3)
-                else:  # file
-                    if not self.response_type == "directory":
-                        if self.filetypes is None or self.filetypes is not None and f".{item.split(".")[-1]}" in self.filetypes:
-                            label = ctk.CTkLabel(self.explorer_frame, text=f"  {item}", compound="left", image=self.file_image)
-                            label.bind("<Button-1>", lambda event, p=join_paths(path, item): self._select(p))  # left click
-                            label.bind("<MouseWheel>", self._mousewheel)
-                            label.grid(row=row, column=0, sticky="w", padx=3, pady=3)
-                row += 1
+        """ Fills the explorer_frame with the files at self.path_to_show
+
+        If the directory is cached, the cached items are shown and the scanning thread only checks that the directory did not change,
+        otherwise the directory is scanned in a background thread and the items are added by batches
+        """
+        if self._searching:
+            self._stop_search()
+        if self._shown_path is not None:
+            self._empty_explorer()
+        path = normalize_directory(self.path_to_show.get())
+        self._shown_path = path
+        cached = self._listing_cache.get(path)
+        if cached is not None:
+            self._listing_cache.move_to_end(path)
+            self._entries = cached["entries"]
+            self._row_widgets = cached["widgets"]
+            if self.virtualized:
+                self._update_scrollregion()
+            else:
+                empty_frame = self.explorer_frame
+                self._set_explorer_frame(cached["frame"])
+                empty_frame.destroy()
+            if (self._entries.sort_column, self._entries.reverse) != (self._sort_column, self._sort_reverse):  # sorted differently since cached
+                self._sort_rows()
+            if not self.virtualized:
+                self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            self.canvas.xview_moveto(cached["scroll"][0])
+            self.canvas.yview_moveto(cached["scroll"][1])
+            if self.virtualized:
+                self._render_visible_rows()
+            self._start_scan(path, cached["mtime"])
+        else:
+            self._entries = _Listing()
+            self._row_widgets = []
+            if self.virtualized:
+                self._update_scrollregion()
             self._reset_scrolling()
+            self._start_scan(path, None)
+
+    def _start_scan(self, path: str, known_mtime: int | None):
+        """ Starts the scanning thread of the given directory, see self._scan_directory """
+        self._scan_mtime = None
+        self._scan_known_mtime = known_mtime
+        self._scan_cancel = threading.Event()
+        self._scan_results = queue.Queue()
+        threading.Thread(target=self._scan_directory, args=(path, known_mtime, self._stat_entries, self._scan_cancel, self._scan_results), daemon=True).start()
+        if known_mtime is None:
+            self.loading_label.place(in_=self.canvas, relx=1, rely=1, x=-3, y=-3, anchor="se")
+        self._scan_after_id = self.after(self._scan_poll_interval, self._receive_scan_results)
+
+    def _receive_scan_results(self):
+        """ Adds the items sent by the scanning thread to the explorer """
+        self._scan_after_id = None
+        new_entries = []
+        finished = False
+        try:
+            for _ in range(8):  # limits the number of rows added at once to keep the ui responsive
+                batch = self._scan_results.get_nowait()
+                if batch is None:
+                    finished = True
+                    break
+                elif type(batch) is list:
+                    new_entries.extend(batch)
+                else:  # mtime of the directory (first result)
+                    self._scan_mtime = batch
+                    if self._scan_known_mtime is not None and batch != self._scan_known_mtime:  # the cached directory changed
+                        self._uncache_shown_directory()
+        except queue.Empty:
+            pass
+
+        if new_entries:
+            self._add_rows(new_entries)
+        if finished:
+            if self._scan_known_mtime is None:  # the directory was entirely scanned
+                self._sort_rows()
+                if self._scan_mtime is not None:
+                    self._cache_shown_directory()
+            self._scan_cancel = None
+            self._scan_results = None
+            self.loading_label.place_forget()
+            if self.folder_sizes:
+                self._request_folder_sizes([name for name, is_directory in self._entries if is_directory])
+            if self.watch:
+                self._start_watch()
+        else:
+            self._scan_after_id = self.after(self._scan_poll_interval, self._receive_scan_results)
+
+    def _cache_shown_directory(self):
+        """ Adds the shown directory to the cache and removes the least recently used directories if the cache is full """
+        if self._cache_size > 0:
+            self._listing_cache[self._shown_path] = {"mtime": self._scan_mtime, "entries": self._entries, "widgets": self._row_widgets, "scroll": (0, 0),
+                                                     "frame": None if self.virtualized else self.explorer_frame}
+            self._listing_cache.move_to_end(self._shown_path)
+            while len(self._listing_cache) > self._cache_size:
+                path, cached = self._listing_cache.popitem(last=False)
+                if cached["frame"] is not None and cached["frame"] is not self.explorer_frame:
+                    cached["frame"].destroy()
+
+    def _uncache_shown_directory(self):
+        """ Removes the shown directory from the cache (it changed) and empties the explorer so it can be scanned again """
+        self._listing_cache.pop(self._shown_path, None)
+        self._scan_known_mtime = None
+        self._clear_rows()
+        self.loading_label.place(in_=self.canvas, relx=1, rely=1, x=-3, y=-3, anchor="se")
+
+    def _clear_rows(self):
+        """ Removes all the rows of the shown directory, the rows are not kept in the cache """
+        self._entries = _Listing()
+        self._selected_name = None
+        self._row_widgets = []
+        if self.virtualized:
+            self._row_pool.hide()
+            self._update_scrollregion()
+        else:
+            for children in self.explorer_frame.winfo_children():
+                children.destroy()
+        self._reset_scrolling()
+
+    def _create_row_widgets(self, index: int) -> tuple[ctk.CTkLabel, ...]:
+        """ Creates the (name label, *column labels) of the item at the given index in the explorer_frame, only used when not virtualized """
+        name, is_directory = self._entries[index]
+        path = self.file_system.join(self._shown_path, name)
+        label = ctk.CTkLabel(self.explorer_frame, text=f"  {name}", compound="left", image=self._row_image(name, is_directory),
+                             fg_color=self._selection_color if name == self._selected_name else "transparent")
+        label.bind("<Button-1>", lambda event, n=name: self._select_row(self._row_index(n)))  # left click, the index of the row changes when the items are sorted
+        if is_directory:
+            label.bind("<Double-Button-1>", lambda event, p=path: self._move_to(p))  # double left click
+        bind_mousewheel(label, self.canvas)
+        widgets = (label, *(ctk.CTkLabel(self.explorer_frame, text=text) for text in self._column_texts(index)))
+        self._grid_row(widgets, index)
+        return widgets
+
+    def _grid_row(self, widgets: tuple[ctk.CTkLabel, ...], row: int):
+        """ Grids the given (name label, *column labels) at the given row of the explorer_frame """
+        widgets[0].grid(row=row, column=0, sticky="w", padx=3, pady=3)
+        for column, widget in enumerate(widgets[1:], 1):
+            widget.grid(row=row, column=column, sticky="e", padx=10, pady=3)
+
+    def _add_rows(self, entries: list[tuple]):
+        """ Adds the given (name, is_directory) or (name, is_directory, size, mtime) items at the end of the explorer """
+        start = len(self._entries)
+        for entry in entries:
+            self._entries.append(*entry)
+        if self.virtualized:
+            self._update_scrollregion()
+            self._render_visible_rows()
+        else:
+            for index in range(start, len(self._entries)):
+                self._row_widgets.append(self._create_row_widgets(index))
+
+    def _sort_rows(self):
+        """ Sorts the items of the shown directory, in virtualized mode only the visible rows are drawn again """
+        order = self._entries.sort(self._sort_column, self._sort_reverse)
+        if self.virtualized:
+            self._row_pool.hide()
+            self._render_visible_rows()
+        else:  # the labels are moved, not created again
+            widgets = self._row_widgets[:]
+            for row, index in enumerate(order):
+                self._row_widgets[row] = widgets[index]
+                if index != row:
+                    self._grid_row(widgets[index], row)
+
+    def _header_clicked(self, column: str):
+        """ Sorts the items by the clicked column, clicking again on the same column reverses the order """
+        self.sort_items(column, not self._sort_reverse if column == self._sort_column else False)
+
+    def _update_header(self):
+        """ Shows the sorting column and direction in the header """
+        for column, button in self._header_buttons.items():
+            title = {"name": "Name", "size": "Size", "date": "Date"}[column]
+            if column == self._sort_column:
+                title = f"{title} {"▼" if self._sort_reverse else "▲"}"
+            button.configure(text=title)
+
+    def _row_image(self, name: str, is_directory: bool) -> ctk.CTkImage:
+        """ Returns the image shown next to the given item: its thumbnail if it was decoded, its icon otherwise """
+        if is_directory:
+            return self.folder_image
+        if self.thumbnails:
+            path = self.file_system.join(self._shown_path, name)
+            if path in self._thumbnail_images:
+                self._thumbnail_images.move_to_end(path)
+                return self._thumbnail_images[path]
+        return self.file_image
+
+    @staticmethod
+    def _make_thumbnail(file_system: FileSystem, path: str, size: tuple[int, int], cache_directory: str) -> Image.Image | None:
+        """ Internal method executed in a background thread: returns the thumbnail of the given image file (loaded from the cache directory if possible), None if the file is not a readable image """
+        try:
+            key = f"{file_system.full_path(path)}|{size[0]}x{size[1]}|{file_system.stat(path).st_mtime_ns}"
+            cache_path = os.path.join(cache_directory, hashlib.sha1(key.encode()).hexdigest() + ".png")
+            if os.path.isfile(cache_path):
+                with Image.open(cache_path) as image:
+                    thumbnail = image.copy()
+                try:
+                    os.utime(cache_path)  # the mtime of the cached thumbnails is their last use
+                except OSError:
+                    pass
+                return thumbnail
+
+            with file_system.open(path) as file, Image.open(file) as image:
+                image.draft("RGB", size)  # JPEG images are decoded at a reduced scale
+                image.thumbnail(size, reducing_gap=2.0)  # reduces the image before resampling it
+                thumbnail = Image.new("RGBA", size, (0, 0, 0, 0))  # the thumbnail is centered in a transparent square
+                thumbnail.paste(image.convert("RGBA"), ((size[0] - image.width) // 2, (size[1] - image.height) // 2))
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return None
+
+        try:  # the thumbnail is written in a temporary file first so the other threads never read an incomplete file
+            os.makedirs(cache_directory, exist_ok=True)
+            temporary_path = f"{cache_path}.{threading.get_ident()}.tmp"
+            thumbnail.save(temporary_path, "PNG")
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            pass
+        return thumbnail
+
+    @staticmethod
+    def _prune_thumbnail_cache(cache_directory: str, max_files: int):
+        """ Internal method executed in a background thread: deletes the least recently used thumbnails of the cache directory beyond max_files thumbnails (the thumbnails of the deleted or modified files are never used again) """
+        try:
+            with os.scandir(cache_directory) as iterator:
+                files = [(entry.stat().st_mtime, entry.path) for entry in iterator if entry.name.endswith(".png") and entry.is_file()]
+        except OSError:
+            return
+        if len(files) <= max_files:
+            return
+        for mtime, path in heapq.nsmallest(len(files) - max_files, files):
+            try:
+                os.remove(path)
+            except OSError:  # deleted by another explorer
+                pass
+
+    def _update_column_texts(self, index: int):
+        """ Updates the texts of the columns of the row at the given index, if the row is shown """
+        if not self.virtualized:
+            for label, text in zip(self._row_widgets[index][1:], self._column_texts(index)):
+                label.configure(text=text)
+        else:
+            slot = self._row_pool.slot_of(index)
+            if slot is not None:
+                for text_id, text in zip(self._row_pool.slots[slot][2], self._column_texts(index)):
+                    self.canvas.itemconfigure(text_id, text=text)
+
+    @staticmethod
+    def _compute_folder_size(file_system: FileSystem, path: str, known: tuple[int, int] | None, cancel_event: threading.Event) -> tuple[int, int] | None:
+        """Internal method executed in a background thread: returns the (mtime, size) of the given directory, the size being the total size of the files it contains (recursively)
+
+        known is the last computed (mtime, size) of the directory, it is returned without walking the directory again if the mtime did not change.
+        None is returned if the directory cannot be read or if cancel_event is set.
+        """
+        try:
+            mtime = file_system.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        if known is not None and known[0] == mtime:
+            return known
+
+        size = 0
+        directories = [path]
+        while directories:
+            try:
+                with file_system.scandir(directories.pop()) as iterator:
+                    for entry in iterator:
+                        if cancel_event.is_set():
+                            return None
+                        try:
+                            if entry.is_dir(follow_symlinks=False):  # symbolic links are not followed, they could create loops
+                                directories.append(entry.path)
+                            else:
+                                size += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            pass
+            except OSError:  # permission denied...
+                pass
+        return mtime, size
+
+    def _request_folder_sizes(self, names: list[str]):
+        """ Requests the sizes of the given directories of the shown directory, the memorized sizes are only computed again if the directory mtime changed """
+        if self._folder_size_cancel is None:
+            self._folder_size_cancel = threading.Event()
+        if self._folder_size_executor is None:
+            self._folder_size_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="FileExplorer-sizes")
+        for name in names:
+            path = self.file_system.join(self._shown_path, name)
+            if path not in self._folder_size_requests:
+                future = self._folder_size_executor.submit(self._compute_folder_size, self.file_system, path, self._folder_size_memory.get(path), self._folder_size_cancel)
+                future.add_done_callback(lambda f, p=path: f.cancelled() or self._folder_size_results.put((p, None if f.exception() else f.result())))
+                self._folder_size_requests[path] = future
+        if self._folder_size_requests and self._folder_size_after_id is None:
+            self._folder_size_after_id = self.after(100, self._receive_folder_sizes)
+
+    def _receive_folder_sizes(self):
+        """ Shows the directory sizes computed by the background threads in the rows """
+        self._folder_size_after_id = None
+        received = set()
+        try:
+            while True:
+                path, result = self._folder_size_results.get_nowait()
+                self._folder_size_requests.pop(path, None)
+                if result is not None:  # the sizes of the previous directories are memorized even if they are not shown anymore
+                    self._folder_size_memory[path] = result
+                    self._folder_size_memory.move_to_end(path)
+                    received.add(path)
+            while len(self._folder_size_memory) > self._folder_size_memory_size:
+                self._folder_size_memory.popitem(last=False)
+        except queue.Empty:
+            pass
+
+        if received and not self._searching and self._shown_path is not None:
+            for index, name in enumerate(self._entries.names):
+                if not self._entries.kinds[index]:  # the directories are before the files
+                    break
+                if self.file_system.join(self._shown_path, name) in received:
+                    self._update_column_texts(index)
+        if self._folder_size_requests:
+            self._folder_size_after_id = self.after(100, self._receive_folder_sizes)
+
+    def _cancel_folder_sizes(self):
+        """ Cancels the computation of the directory sizes, the computed sizes stay in memory """
+        if self._folder_size_cancel is not None:
+            self._folder_size_cancel.set()
+            self._folder_size_cancel = None
+        for future in self._folder_size_requests.values():
+            future.cancel()
+        self._folder_size_requests = {}
+        if self._folder_size_after_id is not None:
+            self.after_cancel(self._folder_size_after_id)
+            self._folder_size_after_id = None
+
+    def _request_thumbnails(self):
+        """ Requests the thumbnails of the visible image files, the requests of the rows that are not visible anymore are cancelled """
+        first, last = self._visible_range()
+        visible = set()
+        for name, is_directory in self._entries[first:last]:
+            if not is_directory and os.path.splitext(name)[1].lower() in Image.registered_extensions():
+                visible.add(self.file_system.join(self._shown_path, name))
+
+        for path in list(self._thumbnail_requests):
+            if path not in visible and self._thumbnail_requests[path].cancel():
+                del self._thumbnail_requests[path]
+
+        size = (round(self._apply_widget_scaling(self._thumbnail_size[0])), round(self._apply_widget_scaling(self._thumbnail_size[1])))
+        for path in visible:
+            if path not in self._thumbnail_images and path not in self._thumbnail_requests and path not in self._thumbnail_failures:
+                if self._thumbnail_executor is None:
+                    self._thumbnail_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="FileExplorer-thumbnails")
+                    self._thumbnail_executor.submit(self._prune_thumbnail_cache, self._thumbnail_cache_dir, self._thumbnail_cache_files)
+                future = self._thumbnail_executor.submit(self._make_thumbnail, self.file_system, path, size, self._thumbnail_cache_dir)
+                future.add_done_callback(lambda f, p=path: f.cancelled() or self._thumbnail_results.put((p, None if f.exception() else f.result())))
+                self._thumbnail_requests[path] = future
+
+        if self._thumbnail_requests and self._thumbnail_after_id is None:
+            self._thumbnail_after_id = self.after(50, self._receive_thumbnails)
+
+    def _receive_thumbnails(self):
+        """ Shows the thumbnails decoded by the background threads on the visible rows """
+        self._thumbnail_after_id = None
+        received = False
+        try:
+            while True:
+                path, image = self._thumbnail_results.get_nowait()
+                self._thumbnail_requests.pop(path, None)
+                if image is None:
+                    self._thumbnail_failures.add(path)
+                else:
+                    self._thumbnail_images[path] = ctk.CTkImage(image, image, self._thumbnail_size)
+                    self._thumbnail_images.move_to_end(path)
+                    while len(self._thumbnail_images) > self._thumbnail_memory_size:
+                        self._thumbnail_images.popitem(last=False)
+                    received = True
+        except queue.Empty:
+            pass
+
+        if received:
+            first, last = self._visible_range()
+            for index in range(first, last):
+                name, is_directory = self._entries[index]
+                path = self.file_system.join(self._shown_path, name)
+                if not is_directory and path in self._thumbnail_images:
+                    if not self.virtualized:
+                        self._row_widgets[index][0].configure(image=self._thumbnail_images[path])
+                    else:
+                        slot = self._row_pool.slot_of(index)
+                        if slot is not None:
+                            self._row_pool.slots[slot][0].configure(image=self._thumbnail_images[path])
+        if self._thumbnail_requests:
+            self._thumbnail_after_id = self.after(50, self._receive_thumbnails)
+
+    def _snapshot_directory(self, path: str) -> dict[str, tuple[bool, int | None]] | None:
+        """ Returns {name: (is_directory, inode)} of the items of the given directory that can be shown, None if the directory cannot be read """
+        snapshot = {}
+        try:
+            with self.file_system.scandir(path) as iterator:
+                for entry in iterator:
+                    try:
+                        is_directory = entry.is_dir()
+                    except OSError:
+                        is_directory = False
+                    if self._can_be_shown(entry.name, is_directory):
+                        try:
+                            inode = entry.inode() or None
+                        except OSError:
+                            inode = None
+                        snapshot[entry.name] = (is_directory, inode)
+        except OSError:
+            return None
+        return snapshot
+
+    def _watch_directory(self, path: str, shown_names: list[str], stats: bool, cancel_event: threading.Event, results: queue.Queue):
+        """ Internal method executed in a background thread: watches the given directory and sends its changes (mtime, added, removed, renamed) until cancel_event is set
+
+        added is a list of (name, is_directory, size, mtime) (the size and mtime are -1 if stats is False), removed a list of names and renamed a list of (old_name, new_name, is_directory).
+        A renamed item is detected when a removed item and an added item have the same inode.
+        """
+        notifier = None
+        if inotify_activated and isinstance(self.file_system, LocalFileSystem):  # the paths of the other file systems are not paths of the computer
+            try:
+                notifier = inotify_simple.INotify()
+                notifier.add_watch(path, inotify_simple.flags.CREATE | inotify_simple.flags.DELETE | inotify_simple.flags.MOVED_FROM | inotify_simple.flags.MOVED_TO)
+            except OSError:  # inotify not available on this system / filesystem
+                if notifier is not None:
+                    notifier.close()
+                notifier = None
+
+        snapshot = {name: (False, None) for name in shown_names}  # the inodes of the shown items are unknown
+        mtime = None
+        try:
+            while not cancel_event.is_set():
+                try:
+                    new_mtime = self.file_system.stat(path).st_mtime_ns
+                except OSError:
+                    new_mtime = mtime
+                if new_mtime != mtime:
+                    new_snapshot = self._snapshot_directory(path)
+                    if new_snapshot is not None:
+                        added = [name for name in new_snapshot if name not in snapshot]
+                        removed = [name for name in snapshot if name not in new_snapshot]
+                        removed_inodes = {snapshot[name][1]: name for name in removed if snapshot[name][1] is not None}
+                        renamed = []
+                        for name in added:
+                            if new_snapshot[name][1] in removed_inodes:
+                                renamed.append((removed_inodes.pop(new_snapshot[name][1]), name, new_snapshot[name][0]))
+                        renamed_names = {old_name for old_name, new_name, is_directory in renamed} | {new_name for old_name, new_name, is_directory in renamed}
+                        added = [(name, new_snapshot[name][0], *self._path_stats(self.file_system, self.file_system.join(path, name), stats)) for name in added if name not in renamed_names]
+                        removed = [name for name in removed if name not in renamed_names]
+                        if added or removed or renamed:
+                            results.put((new_mtime, added, removed, renamed))
+                        snapshot = new_snapshot
+                        mtime = new_mtime
+
+                # waiting for the next change
+                if notifier is not None:
+                    notifier.read(timeout=self._watch_interval)
+                else:
+                    cancel_event.wait(self._watch_interval / 1000)
+        finally:
+            if notifier is not None:
+                notifier.close()
+
+    @staticmethod
+    def _path_stats(file_system: FileSystem, path: str, stats: bool) -> tuple[int, float]:
+        """ Returns the (size, mtime) of the given path, (-1, -1) if they cannot be read or if stats is False """
+        if stats:
+            try:
+                result = file_system.stat(path)
+                return result.st_size, result.st_mtime
+            except OSError:
+                pass
+        return -1, -1.
+
+    def _start_watch(self):
+        """ Starts the thread watching the shown directory, see self._watch_directory """
+        self._stop_watch()
+        self._watch_cancel = threading.Event()
+        self._watch_results = queue.Queue()
+        threading.Thread(target=self._watch_directory, args=(self._shown_path, list(self._entries.names), self._stat_entries, self._watch_cancel, self._watch_results), daemon=True).start()
+        self._watch_after_id = self.after(100, self._receive_watch_changes)
+
+    def _stop_watch(self):
+        """ Stops watching the shown directory """
+        if self._watch_cancel is not None:
+            self._watch_cancel.set()
+            self._watch_cancel = None
+            self._watch_results = None
+        if self._watch_after_id is not None:
+            self.after_cancel(self._watch_after_id)
+            self._watch_after_id = None
+
+    def _receive_watch_changes(self):
+        """ Applies the changes sent by the watching thread to the rows """
+        try:
+            while True:
+                self._apply_changes(*self._watch_results.get_nowait())
+        except queue.Empty:
+            pass
+        self._watch_after_id = self.after(100, self._receive_watch_changes)
+
+    def _apply_changes(self, mtime: int, added: list[tuple[str, bool, int, float]], removed: list[str], renamed: list[tuple[str, str, bool]]):
+        """ Applies the given changes of the shown directory to the existing rows, only the rows of the changed items are created / destroyed """
+        listing = self._entries  # modified in place because it is shared with the cache
+        widgets_by_name = {} if self.virtualized else dict(zip(listing.names, self._row_widgets))
+        if removed or renamed:
+            removed = set(removed)
+            renamed = {old_name: (new_name, is_directory) for old_name, new_name, is_directory in renamed}
+            kept = []
+            moved = []  # (new name, is_directory, size, mtime) of the renamed items, inserted again at their new place
+            for index, name in enumerate(listing.names):
+                if name in renamed:
+                    moved.append((*renamed[name], listing.sizes[index], listing.mtimes[index]))
+                elif name not in removed:
+                    kept.append(index)
+                    continue
+                for widget in widgets_by_name.pop(name, ()):
+                    widget.destroy()
+            listing.keep(kept)
+            added = moved + added
+        for entry in added:
+            listing.insert(*entry)
+        if self.folder_sizes:
+            self._request_folder_sizes([name for name, is_directory, *stats in added if is_directory])
+
+        if self.virtualized:
+            self._row_pool.hide()
+            self._update_scrollregion()
+            self._render_visible_rows()
+        else:  # only the rows that moved are gridded again
+            old_widgets = self._row_widgets[:]
+            self._row_widgets[:] = [widgets_by_name.get(name) for name in listing.names]
+            for index, widgets in enumerate(self._row_widgets):
+                if widgets is None:
+                    self._row_widgets[index] = self._create_row_widgets(index)
+                elif index >= len(old_widgets) or old_widgets[index] is not widgets:
+                    self._grid_row(widgets, index)
+
+        cached = self._listing_cache.get(self._shown_path)
+        if cached is not None:
+            cached["mtime"] = mtime
 
     def _user_path_changed(self, *args):
-        """ Handles the event when self.selected_path is modified """
+        """ Handles the event when self.selected_path is modified, the path is checked when the user stops typing """
         if self.change_path:
-            if os.path.isdir(self.selected_path.get()) and self.selected_path.get() != self.path_to_show.get():
-                if not self.selected_path.get().endswith(" "):
-                    self.path_to_show.set(self.selected_path.get())
-                    self._empty_explorer()
-                    self._fill_explorer()
-            elif os.path.isfile(self.selected_path.get()) and os.path.dirname(self.selected_path.get()) != self.path_to_show.get():  # path to show changed
-                if not os.path.dirname(self.selected_path.get()).endswith(" "):
-                    self.path_to_show.set(os.path.dirname(self.selected_path.get()))
-                    self._empty_explorer()
-                    self._fill_explorer()
+            if self._path_check_after_id is not None:
+                self.after_cancel(self._path_check_after_id)
+            self._path_check_after_id = self.after(self._path_check_delay, self._check_user_path)
+        else:
+            self._hide_completions()
+
+    def _check_user_path(self):
+        """ Shows the completions of the path entered by the user and checks the path in a background thread """
+        self._path_check_after_id = None
+        self._path_check_id += 1
+        path = self.selected_path.get()
+        self._show_completions(path)
+
+        results = queue.Queue()
+        threading.Thread(target=lambda: results.put("directory" if self.file_system.isdir(path) else "file" if self.file_system.isfile(path) else None), daemon=True).start()
+        self.after(15, self._receive_path_check, self._path_check_id, path, results)
+
+    def _receive_path_check(self, check_id: int, path: str, results: queue.Queue):
+        """ Applies the result of the given path check if it is the last one """
+        if check_id != self._path_check_id or path != self.selected_path.get():  # the user modified the path since the check
+            return
+        try:
+            kind = results.get_nowait()
+        except queue.Empty:
+            self.after(15, self._receive_path_check, check_id, path, results)
+            return
+
+        if kind == "directory" and path != self.path_to_show.get():
+            if not path.endswith(" "):
+                self.path_to_show.set(path)
+                self._empty_explorer()
+                self._fill_explorer()
+        elif kind == "file" and os.path.dirname(path) != self.path_to_show.get():  # path to show changed
+            if not os.path.dirname(path).endswith(" "):
+                self.path_to_show.set(os.path.dirname(path))
+                self._empty_explorer()
+                self._fill_explorer()
+
+    def _show_completions(self, path: str):
+        """ Shows the items of the parent directory of the given path starting with its last part, only if the listing of the parent directory is known """
+        parent, prefix = os.path.split(path.replace("\\", "/"))
+        parent = normalize_directory(parent) if parent != "" else parent
+        if parent == self._shown_path and not self._searching:
+            entries = self._entries
+        elif parent in self._listing_cache:
+            entries = self._listing_cache[parent]["entries"]
+        else:
+            entries = []
+
+        self._completions = []
+        if prefix != "":
+            for name, is_directory in entries:
+                if name.startswith(prefix) and name != prefix:
+                    self._completions.append(self.file_system.join(parent, name))
+                    if len(self._completions) == self._completion_count:
+                        break
+
+        if self._completions:
+            for index, label in enumerate(self._completion_labels):
+                if index < len(self._completions):
+                    label.configure(text=f"  {os.path.basename(self._completions[index])}")
+                    label.pack(fill="x", padx=3, pady=1)
+                else:
+                    label.pack_forget()
+            self.completion_frame.place(in_=self.path_entry, relx=0, rely=1, relwidth=1, anchor="nw")
+            self.completion_frame.lift()
+        else:
+            self._hide_completions()
+
+    def _hide_completions(self):
+        """ Hides the completions of the path entry """
+        if self._completions:
+            self._completions = []
+            self.completion_frame.place_forget()
+            return "break"  # prevents the escape key from closing the Filedialog when only the completions should be hidden
+
+    def _complete(self, index: int):
+        """ Replaces the path in the path entry by the given completion """
+        if index < len(self._completions):
+            self.selected_path.set(self._completions[index])
+            self.path_entry.icursor("end")
+            self._hide_completions()
+            return "break"  # prevents the tab key from moving the focus
+
+    def _search_modified(self, *args):
+        """ Handles the event when self.search_var is modified, the search is updated when the user stops typing """
+        if self.change_search:
+            if self._search_after_id is not None:
+                self.after_cancel(self._search_after_id)
+            self._search_after_id = self.after(self._search_delay, self._update_search)
+
+    def _index_directory(self, root: str, index: _FilenameIndex, cancel_event: threading.Event):
+        """ Internal method executed in a background thread: adds the items under the given directory to the index, the shallowest items are added first """
+        directories = deque([""])  # paths relative to root
+        while directories:
+            directory = directories.popleft()
+            try:
+                with self.file_system.scandir(self.file_system.join(root, directory)) as iterator:
+                    for entry in iterator:
+                        if cancel_event.is_set():
+                            return
+                        try:
+                            is_directory = entry.is_dir()
+                        except OSError:
+                            is_directory = False
+                        path = self.file_system.join(directory, entry.name)
+                        if self._can_be_shown(entry.name, is_directory):
+                            if not index.add(path, entry.name, is_directory):
+                                index.complete = True
+                                return
+                        if is_directory and not entry.is_symlink():  # symbolic links could create loops
+                            directories.append(path)
+            except OSError:  # permission denied...
+                pass
+        index.complete = True
+
+    def _update_search(self):
+        """ Shows the results of the search, starts indexing the shown directory if the search just started """
+        self._search_after_id = None
+        if self.search_var.get() == "":
+            if self._searching:
+                self._fill_explorer()  # stops the search and shows the directory again
+            return
+
+        if not self._searching:
+            root = normalize_directory(self.path_to_show.get())
+            self._empty_explorer()
+            self._searching = True
+            self._shown_path = root
+            self._search_index = _FilenameIndex(self._search_max_entries, self._search_max_characters)
+            self._search_cancel = threading.Event()
+            threading.Thread(target=self._index_directory, args=(root, self._search_index, self._search_cancel), daemon=True).start()
+            self.loading_label.configure(text="Searching...")
+            self.loading_label.place(in_=self.canvas, relx=1, rely=1, x=-3, y=-3, anchor="se")
+        self._show_search_results()
+
+    def _show_search_results(self):
+        """ Shows the best results of the search, updates them regularly while the directory is indexed """
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        complete = self._search_index.complete  # read before searching so the last items are not missed
+        results = self._search_index.search(self.search_var.get(), self._search_result_count)
+        if results != self._entries[:]:
+            self._clear_rows()
+            self._add_rows(results)
+        if complete:
+            self.loading_label.place_forget()
+            self.loading_label.configure(text="Loading...")
+        else:
+            self._search_after_id = self.after(self._search_poll_interval, self._show_search_results)
+
+    def _stop_search(self):
+        """ Stops the search and removes its results from the explorer """
+        if self._search_cancel is not None:
+            self._search_cancel.set()
+            self._search_cancel = None
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        self._search_index = None
+        self._searching = False
+        self._clear_rows()
+        self._shown_path = None
+        self.loading_label.place_forget()
+        self.loading_label.configure(text="Loading...")
+        self.change_search = False
+        self.search_var.set("")
+        self.change_search = True
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        if self.virtualized:
+            self.canvas.itemconfigure("column", fill=self._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"]))
+
+    def _clear_cache(self):
+        """ Removes all the directories from the cache """
+        for cached in self._listing_cache.values():
+            if cached["frame"] is not None and cached["frame"] is not self.explorer_frame:
+                cached["frame"].destroy()
+        self._listing_cache.clear()
+
+    def destroy(self):
+        if self._thumbnail_executor is not None:
+            self._thumbnail_executor.shutdown(wait=False, cancel_futures=True)
+        if self._folder_size_executor is not None:
+            self._folder_size_executor.shutdown(wait=False, cancel_futures=True)
+        self._cancel_folder_sizes()
+        if self._thumbnail_after_id is not None:
+            self.after_cancel(self._thumbnail_after_id)
+        if self._search_cancel is not None:
+            self._search_cancel.set()
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        self._cancel_scan()
+        if self._path_check_after_id is not None:
+            self.after_cancel(self._path_check_after_id)
+        self._path_check_id += 1  # ignores the running path check
+        super().destroy()
 
     def get_path(self):
         """Returns the selected path
 
         :return: selected path, "" if no paths were selected
         """
-        if self.response_type == "file" and os.path.isfile(self.selected_path.get()):
+        if self.response_type == "file" and self.file_system.isfile(self.selected_path.get()):
             return self.selected_path.get()
-        elif self.response_type == "directory" and os.path.isdir(self.selected_path.get()):
+        elif self.response_type == "directory" and self.file_system.isdir(self.selected_path.get()):
             return self.selected_path.get()
         else:
             return ""
 
+    def sort_items(self, column: Literal["name", "size", "date"], reverse: bool = False):
+        """Sorts the items of the explorer, the directories are always shown before the files
+
+        :param column: column used to sort the items ("name" / "size" / "date")
+        :param reverse: if set to True, the items are sorted in descending order
+        """
+        if column not in ["name", "size", "date"]:
+            raise ValueError(f"column should be \"name\", \"size\" or \"date\", not {column}")
+        self._sort_column, self._sort_reverse = column, reverse
+        self._update_header()
+
+        if column != "name" and not self._stat_entries:  # the sizes and modification times were not read
+            self._stat_entries = True
+            self._clear_cache()
+            if not self._searching:
+                self._fill_explorer()
+        elif not self._searching and (self._scan_cancel is None or self._scan_known_mtime is not None):  # the running scans sort the items when they end
+            self._sort_rows()
+
+    def refresh(self):
+        """ Shows the items of the current directory again, if the directory is cached its items are shown instantly and checked in background """
+        self._fill_explorer()
+
     def move_to(self, path: str):
         """Changes the current directory to the given one
 
         :param path: path of the directory to move to
         """
-        if os.path.isdir(path):
+        if self.file_system.isdir(path):
             self._move_to(path)
         else:
             raise ValueError(f"The given path isn't a directory: {path}")
@@ -248,7 +1606,8 @@ class FileExplorer(ctk.CTkFrame):
 
 class Filedialog(ctk.CTkToplevel):
     def __init__(self, responsetype: Literal["file", "directory"], title: str, filetypes: list[str] = None,
-                 initialdir: str = None, initialfile: str = None, geometry: str = "400x550"):
+                 initialdir: str = None, initialfile: str = None, geometry: str = "400x550", file_system: FileSystem = None,
+                 persistent: bool = False):
         """Creates a filedialog instance to ask for a file / directory
 
         :param responsetype: type of the selected response: "file" / "directory"
@@ -257,8 +1616,11 @@ class Filedialog(ctk.CTkToplevel):
         :param initialdir: initial directory to start the search from, None if initialfile is not None
         :param initialfile: initial file selected
         :param geometry: initial geometry of the toplevel, default is "400x500"
+        :param file_system: file system to browse (ex: ArchiveFileSystem), default is LocalFileSystem
+        :param persistent: if set to True, the dialog is withdrawn instead of being destroyed when it is closed and can be shown again with show(), keeping its directory, scrolling and cache
         """
         self.path = None
+        self.persistent = persistent
 
         super().__init__()
         self.lift()  # lift window on top
@@ -270,7 +1632,7 @@ class Filedialog(ctk.CTkToplevel):
 
         self.protocol("WM_DELETE_WINDOW", self._kill_event)
 
-        self.explorer = FileExplorer(self, responsetype, filetypes, initialdir, initialfile)
+        self.explorer = FileExplorer(self, responsetype, filetypes, initialdir, initialfile, file_system=file_system)
         self.ok_button = ctk.CTkButton(self, text="Ok", command=self._ok_event)
         self.cancel_button = ctk.CTkButton(self, text="Cancel", command=self._cancel_event)
 
@@ -286,50 +1648,122 @@ class Filedialog(ctk.CTkToplevel):
         self.bind("<Return>", self._ok_event)
         self.bind("<Escape>", self._cancel_event)
 
+        self._closed = ctk.BooleanVar(self, value=False)  # set to True when a persistent dialog is withdrawn
+
     def _ok_event(self, event=None):
         path = self.explorer.get_path()
         if path != "":
             self.path = path
-            self.grab_release()
-            self.destroy()
+            self._close()
         else:
             showwarning("Entering path", "Please select a path")
 
     def _cancel_event(self, event=None):
         self.path = None
-        self.grab_release()
-        self.destroy()
+        self._close()
 
     def _kill_event(self, event=None):
         self.path = None
+        self._close()
+
+    def _close(self):
+        """ Destroys the dialog, or withdraws it if it is persistent """
         self.grab_release()
-        self.destroy()
+        if self.persistent:
+            self.withdraw()
+            self._closed.set(True)
+        else:
+            self.destroy()
+
+    def show(self, title: str = None, initialdir: str = None, initialfile: str = None):
+        """Shows again a persistent dialog that was closed, the dialog stays in the last directory if initialdir and initialfile are None
+
+        :param title: new title of the widget, None to keep the current title
+        :param initialdir: directory to show
+        :param initialfile: file to select
+        """
+        if initialdir is not None and initialfile is not None:
+            raise ValueError("Cannot use initialdir and initialfile at the same time, please set only one")
+        self.path = None
+        self._closed.set(False)
+        if title is not None:
+            self.title(title)
+        if initialdir is not None:
+            self.explorer.move_to(initialdir)
+        elif initialfile is not None:
+            self.explorer.move_to(os.path.dirname(initialfile))
+            self.explorer._select(initialfile)
+        else:
+            self.explorer.refresh()  # the cached items are shown with their scrolling and checked in background
+
+        self.deiconify()
+        self.lift()
+        self.attributes("-topmost", True)
+        self.grab_set()
 
     def get_response(self) -> str | None:
         """ Waits until the dialog is closed and returns the path the user selected or None if the user cancelled """
-        self.master.wait_window(self)
+        if self.persistent:
+            self.master.wait_variable(self._closed)
+        else:
+            self.master.wait_window(self)
         return self.path
 
 
-def askfile(title: str, filetypes: list[str] = None, initialdir: str = None, initialfile: str = None):
+_persistent_dialogs = {}  # (responsetype, filetypes, file_system): Filedialog reused by askfile / askdir when persistent is True
+
+
+def _get_dialog(responsetype: Literal["file", "directory"], title: str, filetypes: list[str] | None, initialdir: str | None, initialfile: str | None,
+                file_system: FileSystem | None, persistent: bool) -> Filedialog:
+    """ Returns a new Filedialog, or the persistent dialog of the same kind shown again if there is one """
+    if not persistent:
+        return Filedialog(responsetype, title, filetypes, initialdir, initialfile, file_system=file_system)
+
+    key = (responsetype, tuple(filetypes) if filetypes is not None else None, file_system)
+    dialog = _persistent_dialogs.get(key)
+    try:
+        exists = dialog is not None and dialog.winfo_exists()
+    except tkinter.TclError:  # the root window of the dialog was destroyed
+        exists = False
+    if exists:
+        dialog.show(title, initialdir, initialfile)
+    else:
+        dialog = Filedialog(responsetype, title, filetypes, initialdir, initialfile, file_system=file_system, persistent=True)
+        _persistent_dialogs[key] = dialog
+        dialog.bind("<Destroy>", lambda event: _forget_dialog(key, dialog, event), add="+")
+    return dialog
+
+
+def _forget_dialog(key: tuple, dialog: Filedialog, event: tkinter.Event):
+    """ Removes the given persistent dialog once it is destroyed (the <Destroy> event is also received for its children) """
+    if event.widget is dialog and _persistent_dialogs.get(key) is dialog:
+        del _persistent_dialogs[key]
+
+
+def askfile(title: str, filetypes: list[str] = None, initialdir: str = None, initialfile: str = None, file_system: FileSystem = None,
+            persistent: bool = False):
     """Asks for a file to select
 
     :param title: title of the widget
     :param filetypes: extension of the file to enter: ("text", ".txt"), None if the response should be a directory
     :param initialdir: initial directory to start the search from, None if initialfile is not None
     :param initialfile: initial file selected
+    :param file_system: file system to browse (ex: ArchiveFileSystem), default is LocalFileSystem
+    :param persistent: if set to True, the dialog is kept hidden after the selection and shown again instantly by the next calls with the same filetypes and file_system
     :return: path of the selected file, None if the user cancelled
     """
-    dialog = Filedialog("file", title, filetypes, initialdir, initialfile)
+    dialog = _get_dialog("file", title, filetypes, initialdir, initialfile, file_system, persistent)
     return dialog.get_response()
 
 
-def askdir(title: str, initialdir: str = None):
+def askdir(title: str, initialdir: str = None, file_system: FileSystem = None, persistent: bool = False):
     """Asks for a directory / folder to select
 
     :param title: title of the widget
     :param initialdir: initial directory to start the search from
+    :param file_system: file system to browse (ex: ArchiveFileSystem), default is LocalFileSystem
+    :param persistent: if set to True, the dialog is kept hidden after the selection and shown again instantly by the next calls with the same file_system
     :return: path of the selected file, None if the user cancelled
     """
-    dialog = Filedialog("directory", title, initialdir=initialdir)
+    dialog = _get_dialog("directory", title, None, initialdir, None, file_system, persistent)
     return dialog.get_response()
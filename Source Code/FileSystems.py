@@ -0,0 +1,230 @@
+"""
+This file contains the file systems that can be browsed by the FileExplorer
+"""
+
+import os
+import io
+import stat
+import time
+import threading
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Iterator, ContextManager, BinaryIO
+
+
+def join_paths(path: str, *paths: str) -> str:
+    """Joins the given paths and returns the joined path
+
+    :param path: first path to join
+    :param paths: other paths to add
+    :return: final path
+    """
+    return os.path.join(path, *paths).replace("\\", "/")
+
+
+class FileSystem(ABC):
+    """Base class of the file systems browsed by the FileExplorer, the paths always use "/" as separator
+
+    A file system should implement getcwd, scandir, stat, mkdir and open, the other methods have default implementations using them.
+    The items returned by scandir should behave like os.DirEntry (name, is_dir(), is_symlink(), inode() and stat() returning an object with st_size, st_mtime and st_mtime_ns).
+    The methods may be called from background threads.
+    """
+
+    @abstractmethod
+    def getcwd(self) -> str:
+        """ Returns the directory shown when no initial directory is given """
+
+    @abstractmethod
+    def scandir(self, path: str) -> ContextManager[Iterator[os.DirEntry]]:
+        """ Returns a context manager iterating over the items of the given directory, raises OSError if it cannot be read """
+
+    @abstractmethod
+    def stat(self, path: str) -> os.stat_result:
+        """ Returns the stats (st_mode, st_size, st_mtime, st_mtime_ns) of the given path, raises OSError if it does not exist """
+
+    @abstractmethod
+    def mkdir(self, path: str):
+        """ Creates the given directory, raises OSError if it cannot be created """
+
+    @abstractmethod
+    def open(self, path: str) -> BinaryIO:
+        """ Opens the given file in binary read mode """
+
+    def join(self, path: str, *paths: str) -> str:
+        """ Joins the given paths and returns the joined path """
+        return join_paths(path, *paths)
+
+    def full_path(self, path: str) -> str:
+        """ Returns a path identifying the given path across all the file systems (used as cache key) """
+        return path
+
+    def exists(self, path: str) -> bool:
+        """ Returns True if the given path exists """
+        try:
+            self.stat(path)
+            return True
+        except OSError:
+            return False
+
+    def isdir(self, path: str) -> bool:
+        """ Returns True if the given path is a directory """
+        try:
+            return stat.S_ISDIR(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+    def isfile(self, path: str) -> bool:
+        """ Returns True if the given path is a file """
+        try:
+            return not stat.S_ISDIR(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+
+class LocalFileSystem(FileSystem):
+    """ File system of the computer, uses the os module """
+
+    def getcwd(self) -> str:
+        return os.getcwd().replace("\\", "/")
+
+    def scandir(self, path: str) -> ContextManager[Iterator[os.DirEntry]]:
+        return os.scandir(path)
+
+    def stat(self, path: str) -> os.stat_result:
+        return os.stat(path)
+
+    def mkdir(self, path: str):
+        os.mkdir(path)
+
+    def open(self, path: str) -> BinaryIO:
+        return open(path, "rb")
+
+    def full_path(self, path: str) -> str:
+        return os.path.abspath(path)
+
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def isfile(self, path: str) -> bool:
+        return os.path.isfile(path)
+
+
+class _ArchiveEntry:
+    """ Item of an archive, behaves like an os.DirEntry and like the result of its stat() method """
+
+    def __init__(self, name: str, path: str, is_directory: bool, size: int, mtime: float, inode: int):
+        self.name = name
+        self.path = path
+        self.st_mode = stat.S_IFDIR | 0o555 if is_directory else stat.S_IFREG | 0o444
+        self.st_size = size
+        self.st_mtime = mtime
+        self.st_mtime_ns = int(mtime * 1e9)
+        self.st_ino = inode
+        self.member = None  # ZipInfo / TarInfo of the item, None for the directories that are not in the archive
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return stat.S_ISDIR(self.st_mode)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return not stat.S_ISDIR(self.st_mode)
+
+    def is_symlink(self) -> bool:
+        return False
+
+    def inode(self) -> int:
+        return self.st_ino
+
+    def stat(self, follow_symlinks: bool = True) -> "_ArchiveEntry":
+        return self
+
+
+class ArchiveFileSystem(FileSystem):
+    def __init__(self, archive_path: str):
+        """Read-only file system of the items of a zip or tar archive (tar archives can be compressed), the paths start with "/" which is the root of the archive
+
+        The members of the archive are read once and indexed by directory, the archive stays open until close() is called.
+
+        :param archive_path: path of the zip / tar archive
+        """
+        if zipfile.is_zipfile(archive_path):
+            self._archive = zipfile.ZipFile(archive_path)
+            members = [(info.filename, info.is_dir(), info.file_size, time.mktime(info.date_time + (0, 0, -1)), info) for info in self._archive.infolist()]
+        elif tarfile.is_tarfile(archive_path):
+            self._archive = tarfile.open(archive_path)
+            members = [(info.name, info.isdir(), info.size, info.mtime, info) for info in self._archive.getmembers() if info.isdir() or info.isfile()]
+        else:
+            raise ValueError(f"The given path isn't a zip or tar archive: {archive_path}")
+
+        self.archive_path = archive_path
+        self._lock = threading.Lock()  # the archive file is shared by all the threads
+        root = _ArchiveEntry("", "/", True, 0, os.stat(archive_path).st_mtime, 0)
+        self._entries = {"/": root}  # path: _ArchiveEntry
+        self._children = {"/": {}}  # directory path: {name: _ArchiveEntry}
+        for name, is_directory, size, mtime, member in members:
+            path = self._normalize(name)
+            if path == "/":
+                continue
+            entry = self._add_entry(path, is_directory, size, mtime)
+            if entry.member is None and entry.is_dir() == is_directory:
+                entry.member = member
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        """ Returns the given path relative to the root of the archive, starting with "/" and without "." parts """
+        parts = [part for part in path.replace("\\", "/").split("/") if part not in ("", ".")]
+        return "/" + "/".join(parts)
+
+    def _add_entry(self, path: str, is_directory: bool, size: int, mtime: float) -> _ArchiveEntry:
+        """ Adds the given item to the index, its missing parent directories are added too """
+        if path in self._entries:
+            return self._entries[path]
+        parent, name = path.rsplit("/", 1)
+        parent = parent or "/"
+        if parent not in self._children:
+            self._add_entry(parent, True, 0, mtime)
+        entry = _ArchiveEntry(name, path, is_directory, size, mtime, len(self._entries))
+        self._entries[path] = entry
+        self._children.setdefault(parent, {})[name] = entry  # a file of the archive may have the same path as a directory
+        if is_directory:
+            self._children[path] = {}
+        return entry
+
+    def getcwd(self) -> str:
+        return "/"
+
+    def scandir(self, path: str) -> ContextManager[Iterator[_ArchiveEntry]]:
+        path = self._normalize(path)
+        if path not in self._entries:
+            raise FileNotFoundError(f"No such file or directory in the archive: {path}")
+        if path not in self._children:
+            raise NotADirectoryError(f"Not a directory: {path}")
+        return nullcontext(iter(list(self._children[path].values())))
+
+    def stat(self, path: str) -> _ArchiveEntry:
+        path = self._normalize(path)
+        if path not in self._entries:
+            raise FileNotFoundError(f"No such file or directory in the archive: {path}")
+        return self._entries[path]
+
+    def mkdir(self, path: str):
+        raise PermissionError(f"Cannot create a directory in an archive: {self.archive_path}")
+
+    def open(self, path: str) -> BinaryIO:
+        entry = self.stat(path)
+        if entry.is_dir():
+            raise IsADirectoryError(f"Is a directory: {path}")
+        with self._lock:  # the data is read at once since the archive file cannot be read by several threads
+            if isinstance(self._archive, zipfile.ZipFile):
+                data = self._archive.read(entry.member)
+            else:
+                data = self._archive.extractfile(entry.member).read()
+        return io.BytesIO(data)
+
+    def full_path(self, path: str) -> str:
+        return f"{os.path.abspath(self.archive_path)}!{self._normalize(path)}"
+
+    def close(self):
+        """ Closes the archive file """
+        self._archive.close()
@@ -0,0 +1,21 @@
+"""
+This file contains the text matching shared by the FileExplorer and the Selector
+"""
+
+
+def match_score(query: str, name: str) -> int | None:
+    """Returns how well the given name matches the given query, both should be case-folded
+
+    :param query: searched text
+    :param name: name to compare to the query
+    :return: 0 if the name starts with the query, 1 if a word of the name starts with it, 2 if the name contains it, 3 if the characters of the query are in the name in the same order (fuzzy), None if the name does not match
+    """
+    position = name.find(query)
+    if position == 0:
+        return 0
+    elif position != -1:
+        return 1 if not name[position - 1].isalnum() else 2
+    characters = iter(name)
+    if all(character in characters for character in query):
+        return 3
+    return None
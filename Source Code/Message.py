@@ -1,7 +1,7 @@
 import customtkinter as ctk
-import os
-from PIL import Image
 from typing import Literal
+
+from .Assets import get_ctk_image
 try:
     import winsound
     winsound_activated = True
@@ -32,23 +32,14 @@ class Message(ctk.CTkToplevel):
         self.title(title)
 
         if typ == "info":
-            pil_image = Image.open(os.path.join(os.path.dirname(__file__), "Images/info.png"))
-            ctk_image = ctk.CTkImage(pil_image, pil_image, (85, 85))
-            self.image = ctk.CTkLabel(self, text="", image=ctk_image, width=85, height=85)
+            self.image = ctk.CTkLabel(self, text="", image=get_ctk_image("info", size=(85, 85)), width=85, height=85)
             self.image.grid(row=0, column=0, padx=10, pady=15)
-            pil_image.close()
         elif typ == "warning":
-            pil_image = Image.open(os.path.join(os.path.dirname(__file__), "Images/warning.png"))
-            ctk_image = ctk.CTkImage(pil_image, pil_image, (85, 85))
-            self.image = ctk.CTkLabel(self, text="", image=ctk_image, width=85, height=85)
+            self.image = ctk.CTkLabel(self, text="", image=get_ctk_image("warning", size=(85, 85)), width=85, height=85)
             self.image.grid(row=0, column=0, padx=10, pady=15)
-            pil_image.close()
         elif typ == "error":
-            pil_image = Image.open(os.path.join(os.path.dirname(__file__), "Images/error.png"))
-            ctk_image = ctk.CTkImage(pil_image, pil_image, (85, 85))
-            self.image = ctk.CTkLabel(self, text="", image=ctk_image, width=85, height=85)
+            self.image = ctk.CTkLabel(self, text="", image=get_ctk_image("error", size=(85, 85)), width=85, height=85)
             self.image.grid(row=0, column=0, padx=10, pady=15)
-            pil_image.close()
 
         self.label = ctk.CTkLabel(self, text=message, font=ctk.CTkFont(size=15))
         self.label.grid(row=0, column=1, padx=10, pady=15)
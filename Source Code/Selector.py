@@ -1,91 +1,711 @@
 import customtkinter as ctk
+import bisect
+import heapq
+import itertools
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Literal, Callable, Iterable
+
+from .Matching import match_score
+from .VirtualRows import RowPool, bind_mousewheel
+
+
+class ItemProvider(ABC):
+    """Base class of the sources of items too large to be given to a Selector as a list (ex: a database table), the items are fetched by pages when they are shown
+
+    The items are identified by their position (from 0 to count() - 1), they should all be different.
+    """
+
+    @abstractmethod
+    def count(self) -> int:
+        """ Returns the number of items """
+
+    @abstractmethod
+    def fetch_page(self, offset: int, limit: int) -> list[str]:
+        """ Returns the texts of the items from the given position (at most limit items) """
+
+    @abstractmethod
+    def search(self, query: str, limit: int) -> list[tuple[int, str]]:
+        """ Returns the (position, text) of the first items matching the given query (at most limit items) """
+
+
+class _SelectionBitmap:
+    _inverse = bytes([1, 0]) + bytes(254)  # translation table swapping 0 and 1
+
+    def __init__(self, bits: bytearray):
+        """Selected positions of the items of an ItemProvider, stored as one byte per item (1 if selected) instead of a set
+
+        Selecting all the items or inverting the selections uses one byte per item, whatever the number of selected items.
+        Used like the sets of the selected indexes (in, len, iteration in ascending order, union, difference), the operations return new selections.
+
+        :param bits: selection byte of each position
+        """
+        self._bits = bits
+
+    @classmethod
+    def filled(cls, count: int, selected: bool) -> "_SelectionBitmap":
+        """ Returns a selection of count items where all the items are selected or unselected """
+        return cls(bytearray(b"\x01" * count if selected else count))
+
+    def __contains__(self, index: int) -> bool:
+        return self._bits[index] == 1
+
+    def __len__(self) -> int:
+        return self._bits.count(1)
+
+    def __bool__(self) -> bool:
+        return 1 in self._bits
+
+    def __iter__(self) -> Iterable[int]:
+        return itertools.compress(range(len(self._bits)), self._bits)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _SelectionBitmap) and self._bits == other._bits
+
+    def _with(self, indexes: Iterable[int], value: int) -> "_SelectionBitmap":
+        """ Internal method: returns a copy of the selection where the given indexes are set to the given value """
+        bits = bytearray(self._bits)
+        if isinstance(indexes, range) and indexes.step == 1:
+            bits[indexes.start:indexes.stop] = bytes([value]) * len(indexes)
+        else:
+            for index in indexes:
+                bits[index] = value
+        return _SelectionBitmap(bits)
+
+    def union(self, indexes: Iterable[int]) -> "_SelectionBitmap":
+        """ Returns the selection with the given indexes selected """
+        return self._with(indexes, 1)
+
+    def difference(self, indexes: Iterable[int]) -> "_SelectionBitmap":
+        """ Returns the selection with the given indexes unselected """
+        return self._with(indexes, 0)
+
+    def inverted(self) -> "_SelectionBitmap":
+        """ Returns the selection where the selected items are unselected and the other ones selected """
+        return _SelectionBitmap(self._bits.translate(self._inverse))
+
+
+class _SearchIndex:
+    def __init__(self, items: list[str]):
+        """Index of the items of a Selector, used to find the items matching a search without going through all of them
+
+        The index of each search mode is built at its first search, the trigram index of the contains searches is built in a background thread and the items are scanned until it is ready.
+        The results of the last search are kept: if the new query extends the last one, only the last results are checked again.
+
+        :param items: texts of the items
+        """
+        self._items = items
+        self._sorted_items = None  # (texts sorted, indexes of the items in the same order), used for the prefix searches
+        self._folded_items = None  # case-folded texts of the items, used for the contains searches
+        self._trigrams = None  # trigram: indexes of the items whose case-folded text contains the trigram, in ascending order
+        self._trigrams_thread = None  # thread building self._trigrams and self._characters
+        self._characters = None  # character: indexes of the items whose case-folded text contains the character, in ascending order, used to narrow the fuzzy searches
+        self._last_search = None  # (mode, query, indexes of the matching items)
+        self._sorted_folded = None  # (case-folded texts sorted, indexes of the items in the same order), used for the ranked searches
+        self._joined_by_length = None  # (case-folded texts joined by "\0" from the shortest, position of each text in the joined string, index of each text), used for the fuzzy searches
+        self._fuzzy_budget = 0.004  # time (in s) spent at most on a fuzzy search through all the items, the search is then resumed by continue_ranked
+        self._fuzzy_chunk = 4096  # number of items searched between 2 checks of the time budget
+        self._last_ranked = None  # (query, scorer, indexes of the items containing the query, indexes of the fuzzy matches or None if not searched)
+        self._pending_ranked = None  # (query, limit, (score, length, index) of the matches found, indexes of the items containing the query, position to resume the fuzzy search from) of the last ranked search if it was stopped by the time budget
+
+    def search(self, query: str, mode: Literal["prefix", "contains"]) -> list[int]:
+        """Returns the indexes of the items matching the given query, in ascending order
+
+        :param query: searched text
+        :param mode: "prefix" to find the items starting with the query (case-sensitive), "contains" to find the items containing the query (case-insensitive)
+        :return: indexes of the matching items
+        """
+        if query == "":
+            results = list(range(len(self._items)))
+        elif mode == "prefix":
+            results = self._search_prefix(query)
+        else:
+            results = self._search_contains(query.casefold())
+        self._last_search = (mode, query, results)
+        return results
+
+    def _refinable(self, mode: str, query: str) -> list[int] | None:
+        """ Returns the results of the last search if they contain all the results of the given search, None otherwise """
+        if self._last_search is not None and self._last_search[0] == mode and self._last_search[1] != "":  # the empty query matched all the items
+            last_query = self._last_search[1] if mode == "prefix" else self._last_search[1].casefold()
+            if (query.startswith(last_query) if mode == "prefix" else last_query in query):
+                return self._last_search[2]
+        return None
+
+    def _search_prefix(self, query: str) -> list[int]:
+        """ Returns the indexes of the items starting with the given query """
+        if self._sorted_items is None:
+            order = sorted(range(len(self._items)), key=self._items.__getitem__)
+            self._sorted_items = ([self._items[index] for index in order], order)
+        texts, order = self._sorted_items
+        start = position = bisect.bisect_left(texts, query)  # the items starting with the query follow each other in the sorted texts
+        while position < len(texts) and texts[position].startswith(query):
+            position += 1
+        last_results = self._refinable("prefix", query)
+        if last_results is not None and len(last_results) <= position - start:  # checking the last results is faster than sorting the new ones
+            return [index for index in last_results if self._items[index].startswith(query)]
+        return sorted(order[start:position])
+
+    def _search_contains(self, query: str, candidates: list[int] = None) -> list[int]:
+        """ Returns the indexes of the items containing the given case-folded query, only the given candidates are checked if given (the last results if possible otherwise) """
+        if self._folded_items is None:
+            self._folded_items = [item.casefold() for item in self._items]
+        if candidates is None:
+            candidates = self._refinable("contains", query)
+        if len(query) >= 3 and self._trigrams is None and self._trigrams_thread is None:
+            self._trigrams_thread = threading.Thread(target=self._build_trigrams, daemon=True)
+            self._trigrams_thread.start()
+        if len(query) >= 3 and self._trigrams is not None:
+            rarest = min((self._trigrams.get(query[position:position + 3], []) for position in range(len(query) - 2)), key=len)
+            if candidates is None or len(rarest) < len(candidates):
+                candidates = rarest  # the matching items contain all the trigrams of the query
+        if candidates is None:
+            return [index for index, text in enumerate(self._folded_items) if query in text]
+        return [index for index in candidates if query in self._folded_items[index]]
+
+    def search_ranked(self, query: str, limit: int, scorer: Callable[[str, str], float | None] = match_score) -> list[int]:
+        """Returns the indexes of the best matches of the given query, the best match first
+
+        The matches are sorted by score (lower is better), then by length and position. Only the best matches are kept in a heap instead of sorting all of them.
+        With the default scorer, the prefix matches are found in the sorted items and the contains index is used, the items are only scanned for the fuzzy matches when there are not enough other matches.
+        The scan of the fuzzy matches stops when the time budget is spent, the search is then resumed by continue_ranked while ranked_pending is True.
+
+        :param query: searched text
+        :param limit: maximum number of results
+        :param scorer: function returning the score of a case-folded text for the case-folded query (lower is better), None if it does not match. An item that does not match a query should not match the queries starting with it
+        :return: indexes of the best matching items
+        """
+        self._pending_ranked = None
+        if query == "":
+            return list(range(len(self._items)))
+        query = query.casefold()
+        if self._folded_items is None:
+            self._folded_items = [item.casefold() for item in self._items]
+        last = self._last_ranked
+        if last is not None and (not query.startswith(last[0]) or scorer is not last[1]):
+            last = None  # the last matches do not contain all the new matches
+
+        if scorer is not match_score:
+            candidates = last[2] if last is not None else range(len(self._items))
+            matches = []
+            for index in candidates:
+                score = scorer(query, self._folded_items[index])
+                if score is not None:
+                    matches.append((score, len(self._folded_items[index]), index))
+            self._last_ranked = (query, scorer, [index for score, length, index in matches], None)
+            return [index for score, length, index in heapq.nsmallest(limit, matches)]
+
+        # the matches are searched by category (prefix, word / substring, fuzzy) until there are enough of them
+        if self._sorted_folded is None:
+            order = sorted(range(len(self._items)), key=self._folded_items.__getitem__)
+            self._sorted_folded = ([self._folded_items[index] for index in order], order)
+        texts, order = self._sorted_folded
+        start = position = bisect.bisect_left(texts, query)
+        while position < len(texts) and texts[position].startswith(query):
+            position += 1
+        prefixes = order[start:position]
+        if len(prefixes) >= limit:
+            self._last_ranked = None  # the other matches were not searched
+            return [index for length, index in heapq.nsmallest(limit, ((len(self._folded_items[index]), index) for index in prefixes))]
+
+        contained = self._search_contains(query, last[2] if last is not None else None)
+        matches = [(match_score(query, self._folded_items[index]), len(self._folded_items[index]), index) for index in contained]
+        self._last_ranked = (query, scorer, contained, None)
+        if len(matches) < limit:
+            candidates = last[2] + last[3] if last is not None and last[3] is not None else None  # the last contained items can be fuzzy matches of the new query
+            self._add_fuzzy(query, limit, matches, contained, candidates, 0)
+        return [index for score, length, index in heapq.nsmallest(limit, matches)]
+
+    @property
+    def ranked_pending(self) -> bool:
+        """ True if the fuzzy search of the last ranked search was stopped by the time budget, it is resumed by continue_ranked """
+        return self._pending_ranked is not None
+
+    def continue_ranked(self) -> list[int]:
+        """Resumes the fuzzy search of the last ranked search stopped by the time budget, it can be stopped again (see ranked_pending)
+
+        :return: indexes of the best matches found so far, the best match first
+        """
+        if self._pending_ranked is None:
+            raise ValueError("The last ranked search is complete")
+        query, limit, matches, contained, start = self._pending_ranked
+        self._pending_ranked = None
+        self._add_fuzzy(query, limit, matches, contained, None, start)
+        return [index for score, length, index in heapq.nsmallest(limit, matches)]
+
+    def _add_fuzzy(self, query: str, limit: int, matches: list[tuple], contained: list[int], candidates: list[int] | None, start: int):
+        """Internal method: adds the fuzzy matches of the given case-folded query to the given matches of a ranked search until there are limit matches
+
+        The ranked search is kept in self._pending_ranked if the time budget was spent, and its fuzzy matches in self._last_ranked if all of them were found.
+
+        :param query: case-folded searched text
+        :param limit: maximum number of results of the ranked search
+        :param matches: (score, length, index) of the matches already found, modified
+        :param contained: indexes of the items containing the query, they are not fuzzy matches
+        :param candidates: indexes of the items to check, None to search all the items
+        :param start: position (in the items sorted by length) to resume the search of all the items from
+        """
+        needed = limit - len(matches)
+        fuzzy, resume = self._search_fuzzy(query, needed, set(contained), candidates, start)
+        matches.extend((3, len(self._folded_items[index]), index) for index in fuzzy)
+        if resume is not None:
+            self._pending_ranked = (query, limit, matches, contained, resume)
+        elif len(fuzzy) < needed:  # all the fuzzy matches were found, the next search can be refined from them
+            self._last_ranked = (query, match_score, contained, [index for score, length, index in matches if score == 3])
+
+    def _search_fuzzy(self, query: str, needed: int, excluded: set[int], candidates: list[int] = None, start: int = 0) -> tuple[list[int], int | None]:
+        """Returns the indexes of the items containing the characters of the given case-folded query in the same order (except the excluded ones)
+
+        Only the given candidates are checked if given, or the items containing the rarest character of the query if it is in less than 1 / 8 of the items.
+        Otherwise the items are searched from the shortest (the order of the fuzzy matches in the ranking): the search stops once the needed number of matches is found,
+        or once the time budget is spent, the position of the next item to search is then returned to resume the search.
+
+        :param query: case-folded searched text
+        :param needed: number of matches needed
+        :param excluded: indexes of the items that are not returned (already found)
+        :param candidates: indexes of the items to check, None to search all the items
+        :param start: position (in the items sorted by length) of the first item to search, used when all the items are searched
+        :return: (indexes of the matching items, position to resume the search from or None if it is done)
+        """
+        # each character class stops at the next character of the query so the regex never backtracks, the end of the item is consumed so it matches once
+        pattern = re.compile(re.escape(query[0]) + "".join(f"[^\\0{re.escape(character)}]*+{re.escape(character)}" for character in query[1:]) + "[^\\0]*+")
+        if candidates is None and self._characters is not None:
+            rarest = min((self._characters.get(character, []) for character in set(query)), key=len)
+            if len(rarest) <= len(self._items) // 8:
+                candidates = rarest
+        if candidates is not None:
+            return [index for index in candidates if index not in excluded and pattern.search(self._folded_items[index])], None
+
+        if self._joined_by_length is None:
+            order = sorted(range(len(self._items)), key=lambda index: len(self._folded_items[index]))  # stable: by length then index, like the ranking
+            positions, position = [], 0
+            for index in order:
+                positions.append(position)
+                position += len(self._folded_items[index]) + 1
+            self._joined_by_length = ("\0".join(self._folded_items[index] for index in order), positions, order)
+        joined, positions, order = self._joined_by_length
+        matches = []
+        end_time = time.perf_counter() + self._fuzzy_budget
+        for start in range(start, len(order), self._fuzzy_chunk):
+            if time.perf_counter() > end_time:
+                return matches, start
+            end = positions[start + self._fuzzy_chunk] - 1 if start + self._fuzzy_chunk < len(order) else len(joined)  # before the separator of the last item of the chunk
+            for match in pattern.finditer(joined, positions[start], end):
+                index = order[bisect.bisect_right(positions, match.start()) - 1]
+                if index not in excluded:
+                    matches.append(index)
+                    if len(matches) >= needed:
+                        return matches, None
+        return matches, None
+
+    def _build_trigrams(self):
+        """ Internal method executed in a background thread: builds the trigram and character indexes of the case-folded items """
+        trigrams, characters = {}, {}
+        for index, text in enumerate(self._folded_items):
+            for trigram in {text[position:position + 3] for position in range(len(text) - 2)}:
+                trigrams.setdefault(trigram, []).append(index)
+            for character in set(text):
+                characters.setdefault(character, []).append(index)
+        self._trigrams = trigrams  # set at the end so the searches never use an incomplete index
+        self._characters = characters
 
 
 class Selector(ctk.CTkFrame):
-    def __init__(self, master, items: list[str], multiple_choices=True, *args, **kwargs):
+    def __init__(self, master, items: list[str] | ItemProvider, multiple_choices=True, *args, lightweight: bool = False, search_mode: Literal["prefix", "contains", "ranked"] = "prefix",
+                 command: Callable[[], None] = None, scorer: Callable[[str, str], float | None] = match_score, max_results: int = 100, **kwargs):
         """Selector widgets to select options in a list of options. Includes a search bar to find different elements faster.
 
         :param master: master window for the widget
-        :param items: list of the possible options, they should all be different
+        :param items: list of the possible options, they should all be different, or an ItemProvider fetching the options by pages (the selector is then lightweight and the search is done by the provider)
         :param multiple_choices: Optional: if set to False, the user will be allowed to select only one item (default=True)
         :param args: args for the CTkFrame widget
+        :param lightweight: Optional: if set to True, the items are drawn on a single canvas instead of being CTkCheckBox widgets and only the visible items are drawn (recommended for long lists of items)
+        :param search_mode: Optional: "prefix" to show the items starting with the search (case-sensitive, default), "contains" to show the items containing the search (case-insensitive), "ranked" to show the best matches of the search first (case-insensitive, see scorer)
+        :param command: Optional: function called (without arguments) when the selections change, called once for the bulk operations (select_all, invert...)
+        :param scorer: Optional: function returning the score of an item for the search in "ranked" mode (called with the case-folded search and text, lower is better, None if the item does not match), by default: prefix matches, then word matches, then substring matches, then fuzzy matches
+        :param max_results: Optional: maximum number of items shown in "ranked" mode (default=100)
         :param kwargs: kwargs for the CTkFrame widget
         """
+        if search_mode not in ["prefix", "contains", "ranked"]:
+            raise ValueError(f"search_mode should be \"prefix\", \"contains\" or \"ranked\", not {search_mode}")
+        if max_results < 1:
+            raise ValueError(f"max_results should be at least 1, not {max_results}")
         super().__init__(master, *args, **kwargs)
 
         self.search_var = ctk.StringVar(self)
         self.search_var.trace_add("write", self._search_modified)
         self.search_bar = ctk.CTkEntry(self, textvariable=self.search_var)
         color = kwargs.pop("fg_color") if "fg_color" in kwargs else "transparent"
-        self.checkboxes_frame = ctk.CTkScrollableFrame(self, fg_color=color, *args, **kwargs)
         self.search_bar.pack(anchor="n", fill="x")
-        self.checkboxes_frame.pack(expand=True, fill="both", side="bottom")
 
-        self.checkboxes = []
-        self.selected_indexes = []
+        self.lightweight = lightweight or isinstance(items, ItemProvider)
+        self.checkboxes = []  # CTkCheckBox of the items, empty in lightweight mode
+        self._selected = set()  # indexes of the selected items
         self.multiple_choices = multiple_choices
+        self.command = command
+        self._items = []  # texts of the items
+        self._indexes = {}  # text: index of the items
+        self._provider = None  # ItemProvider of the items, None if the items were given as a list
+        self._count = 0  # number of items of the provider
+        self._page_size = 200  # number of items fetched at once from the provider
+        self._page_cache = OrderedDict()  # page number: texts of the items of the page, the last used page is at the end
+        self._page_cache_size = 16  # maximum number of pages kept in memory
+        self._search_texts = {}  # index: text of the items found by the last search of the provider
+        self._search_limit = 1000  # maximum number of items found by a search of the provider
+        self._shown = []  # indexes of the items matching the search, in the order they are shown
+        self._grid_rows = {}  # index: row of the gridded checkboxes, not used in lightweight mode
+        self._layout_operations = deque()  # (index, row) of the checkboxes to grid / forget (row None), applied by time slices
+        self._layout_after_id = None
+        self._layout_budget = 8  # ms spent at most gridding / forgetting checkboxes in each time slice
+        self._search_after_id = None
+        self._search_delay = 120  # ms without modification of the search bar before the search is applied
+        self._ranked_after_id = None  # resumes the ranked search stopped by its time budget
+        self.search_mode = search_mode
+        self.scorer = scorer
+        self.max_results = max_results
+        self._search_index = _SearchIndex([])
+
+        if self.lightweight:
+            # the items are drawn on the canvas, only the visible ones (+ overscan) exist
+            self._canvas_fg_color = color
+            self.canvas = ctk.CTkCanvas(self, highlightthickness=0, bg=self._canvas_color())
+            self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+            self.canvas.configure(yscrollcommand=self._yscroll)
+            self.scrollbar.pack(side="right", fill="y")
+            self.canvas.pack(expand=True, fill="both", side="left")
+            self._row_height = self._apply_widget_scaling(30)
+            self._box_size = self._apply_widget_scaling(22)
+            self._row_pool = RowPool(self.canvas, self._row_height, self._create_slot, self._draw_slot, self._hide_slot)  # slots: (box id, check mark id, text id), rows: positions in self._shown
+            self._font = ctk.CTkFont()
+            self.canvas.bind("<Configure>", lambda event: self._render_visible_rows())
+            self.canvas.bind("<Button-1>", self._canvas_clicked)
+            bind_mousewheel(self.canvas, self.canvas)
+        else:
+            self.checkboxes_frame = ctk.CTkScrollableFrame(self, fg_color=color, *args, **kwargs)
+            self.checkboxes_frame.pack(expand=True, fill="both", side="bottom")
+
+        if isinstance(items, ItemProvider):
+            self._set_provider(items)
+            self._update_search()
+        else:
+            indexes = {item: index for index, item in enumerate(items)}
+            if len(indexes) == len(items):  # not 2 times the same item
+                self._set_items(items, indexes)
+                self._update_search()
+            else:
+                raise ValueError("There is two times or more the same item in the given items list")
+
+    def _set_provider(self, provider: ItemProvider):
+        """ Internal method: replaces the items of the selector by the items of the given provider, the selections are cleared """
+        self._cancel_layout()
+        self._provider = provider
+        self._count = provider.count()
+        self._page_cache.clear()
+        self._search_texts = {}
+        self._items, self._indexes = [], {}
+        self._search_index = _SearchIndex([])
+        had_selections = bool(self._selected)
+        self._selected = _SelectionBitmap.filled(self._count, False)
+        if had_selections and self.command is not None:
+            self.command()
+
+    def _empty_selection(self) -> set[int] | _SelectionBitmap:
+        """ Internal method: returns a selection without selected item, a bitmap if the items come from an ItemProvider """
+        return set() if self._provider is None else _SelectionBitmap.filled(self._count, False)
+
+    def _item_count(self) -> int:
+        """ Internal method: returns the number of items """
+        return self._count if self._provider is not None else len(self._items)
 
-        if len(set(items)) == len(items):  # not 2 times the same item
-            for index in range(len(items)):
-                self.checkboxes.append(ctk.CTkCheckBox(self.checkboxes_frame, text=items[index], command=lambda a=index: self._selection(a)))
-            self._search_modified()
+    def _item_text(self, index: int) -> str:
+        """ Internal method: returns the text of the item at the given index, the page of the item is fetched from the provider if it is not in the cache """
+        if self._provider is None:
+            return self._items[index]
+        if index in self._search_texts:
+            return self._search_texts[index]
+        page = index // self._page_size
+        if page in self._page_cache:
+            self._page_cache.move_to_end(page)
         else:
-            raise ValueError("There is two times or more the same item in the given items list")
+            self._page_cache[page] = self._provider.fetch_page(page * self._page_size, self._page_size)
+            while len(self._page_cache) > self._page_cache_size:
+                self._page_cache.popitem(last=False)
+        return self._page_cache[page][index - page * self._page_size]
+
+    def _set_items(self, items: list[str], indexes: dict[str, int]):
+        """Internal method: replaces the items of the selector
+
+        The items that were already in the selector keep their checkbox and their selection, only the checkboxes of the new items are created and the checkboxes of the removed items are destroyed.
+
+        :param items: new items
+        :param indexes: text: index of the new items
+        """
+        self._cancel_layout()
+        if self._provider is not None:  # the indexes of the selections were positions in the provider
+            self._provider = None
+            self._page_cache.clear()
+            self._search_texts = {}
+            if self._selected:
+                self._selected = set()
+                if self.command is not None:
+                    self.command()
+        old_items, old_indexes = self._items, self._indexes
+        self._items = list(items)
+        self._indexes = indexes
+        self._search_index = _SearchIndex(self._items)
+
+        if not self.lightweight:
+            old_checkboxes = self.checkboxes
+            self.checkboxes = []
+            for index, item in enumerate(self._items):
+                if item in old_indexes:
+                    self.checkboxes.append(old_checkboxes[old_indexes[item]])
+                else:  # the command finds the index from the text, so the checkbox can be reused when the items change
+                    self.checkboxes.append(ctk.CTkCheckBox(self.checkboxes_frame, text=item, command=lambda t=item: self._selection(self._indexes[t])))
+            for index, item in enumerate(old_items):
+                if item not in indexes:
+                    old_checkboxes[index].destroy()
+
+            # the kept checkboxes are gridded at their new row by the next layout
+            self._grid_rows = {indexes[old_items[old_index]]: row for old_index, row in self._grid_rows.items() if old_items[old_index] in indexes}
+
+        selected = {indexes[old_items[index]] for index in self._selected if old_items[index] in indexes}
+        lost = len(selected) != len(self._selected)
+        self._selected = selected
+        if lost and self.command is not None:
+            self.command()
+
+    @property
+    def selected_indexes(self) -> list[int]:
+        """ Indexes of the selected items, in the order of the items """
+        return sorted(self._selected)
 
     def _selection(self, index: int):
         """ Internal method: selects / unselects the given index """
-        if index in self.selected_indexes:
-            self.selected_indexes.remove(index)
+        if index in self._selected:
+            self._change_selections(self._selected.difference((index,)))
+        elif self.multiple_choices:
+            self._change_selections(self._selected.union((index,)))
         else:
-            if self.multiple_choices:
-                self.selected_indexes.append(index)
-            else:
-                if self.selected_indexes:  # list not empty
-                    for i in self.selected_indexes:
-                        self.checkboxes[i].deselect()
-                    self.selected_indexes.clear()
-                    self.selected_indexes.append(index)
+            self._change_selections(self._empty_selection().union((index,)))
+
+    def _change_selections(self, selected: set[int] | _SelectionBitmap):
+        """ Internal method: replaces the selected indexes, the changed items are drawn again in one pass and the command is called once """
+        old_selected = self._selected
+        self._selected = selected
+        if old_selected == selected:
+            return
+        if not self.lightweight:
+            for index in old_selected ^ selected:
+                if index in selected:
+                    self.checkboxes[index].select()
                 else:
-                    self.selected_indexes.append(index)
+                    self.checkboxes[index].deselect()
+        else:  # only the drawn rows are checked, the selections of an ItemProvider are not compared item by item
+            for slot, position in self._row_pool.drawn():
+                index = self._shown[position]
+                if (index in old_selected) != (index in selected):
+                    self._draw_check(slot, index in selected)
+        if self.command is not None:
+            self.command()
+
+    def _check_multiple_choices(self):
+        """ Internal method: raises a ValueError if only one item can be selected """
+        if not self.multiple_choices:
+            raise ValueError("Cannot select several items when multiple_choices is False")
 
     def _reset_scroll(self):
         """ Internal method: scrolls back to the starting position """
-        self.checkboxes_frame._parent_canvas.yview_moveto(0)
+        if self.lightweight:
+            self.canvas.yview_moveto(0)
+        else:
+            self.checkboxes_frame._parent_canvas.yview_moveto(0)
 
     def _search_modified(self, *args):
-        """ Internal method: modifies the search """
-        value = self.search_var.get()
-        row = 0
-        for x in range(len(self.checkboxes)):
-            if self.checkboxes[x].cget("text").startswith(value):
-                self.checkboxes[x].grid(row=row, column=0, padx=3, pady=3)
-                row += 1
+        """ Internal method: handles the modification of the search bar, the search is applied when the user stops typing """
+        self._cancel_layout()  # the layout of the previous search is abandoned
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(self._search_delay, self._update_search)
+
+    def _update_search(self):
+        """ Internal method: shows the items matching the search """
+        self._search_after_id = None
+        self._cancel_ranked()
+        if self._provider is None and self.search_mode == "ranked":
+            self._shown = self._search_index.search_ranked(self.search_var.get(), self.max_results, self.scorer)
+            if self._search_index.ranked_pending:
+                self._ranked_after_id = self.after(1, self._continue_ranked)
+        elif self._provider is None:
+            self._shown = self._search_index.search(self.search_var.get(), self.search_mode)
+        elif self.search_var.get() == "":
+            self._search_texts = {}
+            self._shown = range(self._count)  # the positions of all the items, without creating a list
+        else:
+            results = self._provider.search(self.search_var.get(), self._search_limit)
+            self._search_texts = dict(results)
+            self._shown = [index for index, text in results]
+        self._show_results(True)
+
+    def _continue_ranked(self):
+        """ Internal method: resumes the ranked search stopped by its time budget, by time slices, the results are shown again if they changed """
+        self._ranked_after_id = None
+        shown = self._search_index.continue_ranked()
+        if self._search_index.ranked_pending:
+            self._ranked_after_id = self.after(1, self._continue_ranked)
+        if shown != self._shown:
+            self._shown = shown
+            self._show_results(False)
+
+    def _cancel_ranked(self):
+        """ Internal method: abandons the ranked search that was not complete """
+        if self._ranked_after_id is not None:
+            self.after_cancel(self._ranked_after_id)
+            self._ranked_after_id = None
+
+    def _show_results(self, reset_scroll: bool):
+        """Internal method: shows the items of self._shown
+
+        :param reset_scroll: if True, scrolls back to the first result
+        """
+        if self.lightweight:
+            self._row_pool.hide()
+            self.canvas.configure(scrollregion=(0, 0, 0, len(self._shown) * self._row_height))
+            if reset_scroll:
+                self._reset_scroll()
+            self._render_visible_rows()
+        else:  # only the checkboxes whose visibility or row changed are gridded / forgotten, by time slices
+            ranked = self.search_mode == "ranked" and self.search_var.get() != ""
+            rows = {index: position if ranked else index for position, index in enumerate(self._shown)}  # the ranked items are shown in score order
+            self._cancel_layout()
+            self._layout_operations.extend((index, None) for index in self._grid_rows if index not in rows)
+            self._layout_operations.extend((index, row) for index, row in rows.items() if self._grid_rows.get(index) != row)
+            if reset_scroll:
+                self._reset_scroll()
+            self._apply_layout()
+
+    def _apply_layout(self):
+        """ Internal method: grids / forgets (row None) the checkboxes of self._layout_operations until the time budget is spent, the next operations are applied in the next time slice """
+        self._layout_after_id = None
+        end = time.perf_counter() + self._layout_budget / 1000
+        while self._layout_operations and time.perf_counter() < end:
+            index, row = self._layout_operations.popleft()
+            if row is not None:
+                self.checkboxes[index].grid(row=row, column=0, padx=3, pady=3)  # the empty rows of the hidden checkboxes have no height
+                self._grid_rows[index] = row
             else:
-                self.checkboxes[x].grid_forget()
-        self._reset_scroll()
+                self.checkboxes[index].grid_forget()
+                self._grid_rows.pop(index, None)
+        if self._layout_operations:
+            self._layout_after_id = self.after(1, self._apply_layout)
+
+    def _cancel_layout(self):
+        """ Internal method: abandons the layout operations that were not applied yet """
+        self._layout_operations.clear()
+        if self._layout_after_id is not None:
+            self.after_cancel(self._layout_after_id)
+            self._layout_after_id = None
+
+    def _canvas_color(self) -> str:
+        """ Internal method: returns the background color of the canvas in lightweight mode """
+        color = self._canvas_fg_color if self._canvas_fg_color != "transparent" else self._fg_color
+        if color == "transparent":
+            color = self._bg_color
+        return self._apply_appearance_mode(color)
+
+    def _yscroll(self, first, last):
+        """ Internal method: handles the vertical scrolling of the canvas in lightweight mode """
+        self.scrollbar.set(first, last)
+        self._render_visible_rows()
+
+    def _render_visible_rows(self):
+        """ Internal method: draws the visible rows (+ overscan) in lightweight mode by recycling the canvas items of the pool """
+        self._row_pool.render(len(self._shown))
+
+    def _create_slot(self, slot: int) -> tuple[int, int, int]:
+        """ Internal method: creates the hidden (box id, check mark id, text id) of a new slot of the pool in lightweight mode """
+        box = self.canvas.create_rectangle(0, 0, 0, 0, width=self._apply_widget_scaling(2), tags="box", state="hidden")
+        check = self.canvas.create_line(0, 0, 0, 0, width=self._apply_widget_scaling(2), tags="check", state="hidden",
+                                        fill=self._apply_appearance_mode(ctk.ThemeManager.theme["CTkCheckBox"]["checkmark_color"]))
+        text = self.canvas.create_text(0, 0, anchor="w", font=self._font, tags="text", state="hidden",
+                                       fill=self._apply_appearance_mode(ctk.ThemeManager.theme["CTkCheckBox"]["text_color"]))
+        return box, check, text
+
+    def _draw_slot(self, slot: int, position: int):
+        """ Internal method: draws the item at the given position in self._shown with the given slot of the pool in lightweight mode """
+        box, check, text = self._row_pool.slots[slot]
+        index = self._shown[position]
+        x, y = self._apply_widget_scaling(6), position * self._row_height + (self._row_height - self._box_size) / 2
+        self.canvas.coords(box, x, y, x + self._box_size, y + self._box_size)
+        self.canvas.coords(check, x + self._box_size * 0.22, y + self._box_size * 0.5, x + self._box_size * 0.42, y + self._box_size * 0.72, x + self._box_size * 0.78, y + self._box_size * 0.28)
+        self.canvas.coords(text, x + self._box_size + self._apply_widget_scaling(8), (position + 0.5) * self._row_height)
+        self.canvas.itemconfigure(text, text=self._item_text(index), state="normal")
+        self.canvas.itemconfigure(box, state="normal")
+        self._draw_check(slot, index in self._selected)
+
+    def _hide_slot(self, slot: int):
+        """ Internal method: hides the canvas items of the given slot of the pool in lightweight mode """
+        for item in self._row_pool.slots[slot]:
+            self.canvas.itemconfigure(item, state="hidden")
+
+    def _draw_check(self, slot: int, checked: bool):
+        """ Internal method: draws the box of the given slot of the pool as checked / unchecked in lightweight mode """
+        box, check, text = self._row_pool.slots[slot]
+        fg_color = self._apply_appearance_mode(ctk.ThemeManager.theme["CTkCheckBox"]["fg_color"])
+        self.canvas.itemconfigure(box, fill=fg_color if checked else "", outline=fg_color if checked else self._apply_appearance_mode(ctk.ThemeManager.theme["CTkCheckBox"]["border_color"]))
+        self.canvas.itemconfigure(check, state="normal" if checked else "hidden")
+
+    def _apply_colors(self):
+        """ Internal method: applies the colors of the appearance mode to the canvas in lightweight mode """
+        self.canvas.configure(bg=self._canvas_color())
+        self.canvas.itemconfigure("text", fill=self._apply_appearance_mode(ctk.ThemeManager.theme["CTkCheckBox"]["text_color"]))
+        self.canvas.itemconfigure("check", fill=self._apply_appearance_mode(ctk.ThemeManager.theme["CTkCheckBox"]["checkmark_color"]))
+        for slot, position in self._row_pool.drawn():
+            self._draw_check(slot, self._shown[position] in self._selected)
+
+    def _canvas_clicked(self, event):
+        """ Internal method: selects / unselects the clicked item in lightweight mode, the item is found from the y coordinate of the click """
+        position = int(self.canvas.canvasy(event.y) // self._row_height)
+        if 0 <= position < len(self._shown):
+            self._selection(self._shown[position])
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        if self.lightweight:
+            self._apply_colors()
+
+    def destroy(self):
+        self._cancel_layout()
+        self._cancel_ranked()
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        super().destroy()
 
     def get_all_items(self) -> list:
-        """ Returns all the items in the selector """
-        return [checkbox.cget("text") for checkbox in self.checkboxes]
+        """ Returns all the items in the selector (all the items of the provider are fetched if the items come from an ItemProvider) """
+        if self._provider is not None:
+            return self._provider.fetch_page(0, self._count)
+        return list(self._items)
 
-    def configure_selector(self, items: list = None, multiple_choices: bool = None):
+    def configure_selector(self, items: list | ItemProvider = None, multiple_choices: bool = None):
         """Changes the given arguments
 
-        :param items: new items to show, if [] is given: deletes all old items
+        :param items: new items to show, if [] is given: deletes all old items. The items that were already in the selector keep their selection. An ItemProvider can only be given to a lightweight selector
         :param multiple_choices: if set to False, the user will be allowed to select only one item
         """
-        if items is not None:
-            if len(set(items)) == len(items):  # not 2 times the same item
-                # destroy old widgets
-                for checkbox in self.checkboxes:
-                    checkbox.destroy()
-                self.checkboxes.clear()
-                self.selected_indexes.clear()
-
-                # create new ones
-                for index in range(len(items)):
-                    self.checkboxes.append(ctk.CTkCheckBox(self.checkboxes_frame, text=items[index], command=lambda a=index: self._selection(a)))
-                self._search_modified()
+        if isinstance(items, ItemProvider):
+            if not self.lightweight:
+                raise ValueError("An ItemProvider can only be used by a lightweight selector")
+            self._set_provider(items)
+            self._update_search()
+        elif items is not None:
+            indexes = {item: index for index, item in enumerate(items)}
+            if len(indexes) == len(items):  # not 2 times the same item
+                self._set_items(items, indexes)
+                self._update_search()
             else:
                 raise ValueError("There is two times or more the same item in the given items list")
 
@@ -94,13 +714,70 @@ class Selector(ctk.CTkFrame):
 
     def clear_selections(self):
         """ Clears the selections """
-        for index in self.selected_indexes:
-            self.checkboxes[index].deselect()
-        self.selected_indexes.clear()
+        self._change_selections(self._empty_selection())
+
+    def select_all(self):
+        """ Selects all the items """
+        self._check_multiple_choices()
+        if self._provider is not None:
+            self._change_selections(_SelectionBitmap.filled(self._count, True))
+        else:
+            self._change_selections(set(range(self._item_count())))
+
+    def select_filtered(self):
+        """ Selects the items matching the search, the other selections are kept """
+        if self._search_after_id is not None:  # the search was modified but not applied yet
+            self.after_cancel(self._search_after_id)
+            self._update_search()
+        if self._ranked_after_id is not None:  # the ranked search is not complete
+            self._cancel_ranked()
+            while self._search_index.ranked_pending:
+                self._shown = self._search_index.continue_ranked()
+            self._show_results(False)
+        self._check_multiple_choices()
+        self._change_selections(self._selected.union(self._shown))
+
+    def invert(self):
+        """ Selects the items that are not selected and unselects the selected ones """
+        self._check_multiple_choices()
+        if self._provider is not None:
+            self._change_selections(self._selected.inverted())
+        else:
+            self._change_selections(set(range(self._item_count())) - self._selected)
+
+    def select_range(self, start: int, end: int):
+        """Selects the items from start to end (excluded), the other selections are kept
+
+        :param start: index of the first item to select (index in get_all_items())
+        :param end: index of the item after the last item to select
+        """
+        if start < 0 or end > self._item_count() or start > end:
+            raise ValueError(f"Invalid range of items: {start} to {end} ({self._item_count()} items)")
+        if start == end:  # empty range, the selections are kept
+            return
+        if end - start > 1:
+            self._check_multiple_choices()
+        self._change_selections((self._selected if self.multiple_choices else self._empty_selection()).union(range(start, end)))
+
+    def set_selections(self, items: Iterable[str]):
+        """Replaces the selections by the given items
+
+        :param items: items to select
+        """
+        if self._provider is not None:
+            raise ValueError("Cannot select items by their text when they come from an ItemProvider, please use select_range")
+        selected = set()
+        for item in items:
+            if item not in self._indexes:
+                raise ValueError(f"The given item is not in the selector: {item}")
+            selected.add(self._indexes[item])
+        if len(selected) > 1:
+            self._check_multiple_choices()
+        self._change_selections(selected)
 
     def get_selections(self) -> list:
         """Returns the selected items
 
-        :return: selected items, empty list if none were selected
+        :return: selected items (in the order of the items), empty list if none were selected
         """
-        return [self.checkboxes[index].cget("text") for index in self.selected_indexes]
+        return [self._item_text(index) for index in sorted(self._selected)]
@@ -0,0 +1,93 @@
+"""
+This file contains the virtualization shared by the FileExplorer and the Selector: only the visible rows of a long list are drawn on a canvas
+"""
+
+import tkinter
+from typing import Any, Callable, Iterator
+
+
+class RowPool:
+    def __init__(self, canvas: tkinter.Canvas, row_height: float, create_slot: Callable[[int], Any], draw_slot: Callable[[int, int], None],
+                 hide_slot: Callable[[int], None], overscan: int = 5):
+        """Slots of canvas items recycled to draw the visible rows (+ overscan) of a list on a canvas, all the rows have the same height
+
+        The row n is always drawn by the slot n % len(slots), so scrolling by one row only draws one slot again.
+
+        :param canvas: canvas on which the rows are drawn, the row n is at the y coordinate n * row_height
+        :param row_height: height of a row in the canvas
+        :param create_slot: function creating the hidden items of a new slot from its number, returns the items (stored in self.slots)
+        :param draw_slot: function drawing the given row with the items of the given slot, called with (slot, row)
+        :param hide_slot: function hiding the items of the given slot
+        :param overscan: number of rows drawn above and under the visible ones
+        """
+        self.canvas = canvas
+        self.row_height = row_height
+        self.overscan = overscan
+        self._create_slot = create_slot
+        self._draw_slot = draw_slot
+        self._hide_slot = hide_slot
+        self.slots = []  # items returned by create_slot
+        self.rows = []  # row drawn by each slot, -1 if hidden
+
+    def visible_range(self, count: int) -> tuple[int, int]:
+        """ Returns the (first, last + 1) visible rows (+ overscan) of a list of count rows """
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        return max(0, int(top // self.row_height) - self.overscan), min(count, int(bottom // self.row_height) + 1 + self.overscan)
+
+    def render(self, count: int):
+        """ Draws the visible rows (+ overscan) of a list of count rows, the rows already drawn by their slot are not drawn again """
+        first, last = self.visible_range(count)
+
+        # growing the pool if the canvas became higher
+        if len(self.slots) < last - first:
+            self.hide()  # the slots of the rows change: every row has to be drawn again
+            while len(self.slots) < last - first:
+                self.slots.append(self._create_slot(len(self.slots)))
+            self.rows = [-1] * len(self.slots)
+
+        shown = set()
+        for row in range(first, last):
+            slot = row % len(self.slots)
+            shown.add(slot)
+            if self.rows[slot] != row:
+                self.rows[slot] = row
+                self._draw_slot(slot, row)
+        for slot, row in enumerate(self.rows):
+            if slot not in shown and row != -1:
+                self._hide_slot(slot)
+                self.rows[slot] = -1
+
+    def hide(self):
+        """ Hides all the rows, they are drawn again by the next render """
+        for slot, row in enumerate(self.rows):
+            if row != -1:
+                self._hide_slot(slot)
+                self.rows[slot] = -1
+
+    def slot_of(self, row: int) -> int | None:
+        """ Returns the slot drawing the given row, None if the row is not drawn """
+        if self.slots and self.rows[row % len(self.slots)] == row:
+            return row % len(self.slots)
+        return None
+
+    def drawn(self) -> Iterator[tuple[int, int]]:
+        """ Returns the (slot, row) of the drawn rows """
+        return ((slot, row) for slot, row in enumerate(self.rows) if row != -1)
+
+
+def bind_mousewheel(widget: tkinter.Misc, canvas: tkinter.Canvas):
+    """ Scrolls the given canvas when the mousewheel is used over the given widget """
+    widget.bind("<MouseWheel>", lambda event: _scroll(canvas, event))  # Windows / macOS
+    widget.bind("<Button-4>", lambda event: _scroll(canvas, event))  # Linux
+    widget.bind("<Button-5>", lambda event: _scroll(canvas, event))
+
+
+def _scroll(canvas: tkinter.Canvas, event: tkinter.Event):
+    """ Scrolls the given canvas for the given mousewheel event """
+    if event.num == 4:
+        canvas.yview_scroll(-1, "units")
+    elif event.num == 5:
+        canvas.yview_scroll(1, "units")
+    elif event.delta != 0:  # the delta is a multiple of 120 on Windows, smaller on macOS
+        canvas.yview_scroll(-int(event.delta / 120) or (-1 if event.delta > 0 else 1), "units")
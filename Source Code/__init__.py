@@ -1,14 +1,16 @@
+from .Assets import get_image, get_ctk_image, preload
 from .AskValue import AskValue, askstring, askinteger, askfloat
 from .AskDialog import AskDialog, askyesno
 from .Message import Message, showinfo, showwarning, showerror
 from .FileExplorer import FileExplorer, Filedialog, askfile, askdir
-from .Selector import Selector
+from .FileSystems import FileSystem, LocalFileSystem, ArchiveFileSystem
+from .Selector import Selector, ItemProvider
 from .SmoothFrame import SmoothFrame, get_coordinates_from_grid
 from .BetterCTkImage import BetterCTkImage
-from .AnimatedImage import AnimatedImage
+from .AnimatedImage import AnimatedImage, set_max_frame_rate, get_max_frame_rate
 from .Separator import Separator
 from .DateSelector import Date, DateSelector, DateSelectorButton
 
 
-_version = "5.2.0"
-__version__ = "5.2.0"
+_version = "5.3.0"
+__version__ = "5.3.0"